@@ -0,0 +1,139 @@
+"""
+Пакетное извлечение адресов из приватных ключей с кешем на диске
+"""
+import os
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from logging_setup import setup_logging
+from config import ADDRESS_CACHE_FILE, ADDRESS_DERIVE_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# С какого количества ключей имеет смысл запускать пул процессов
+POOL_THRESHOLD = 256
+
+
+def _normalize_key(private_key: str) -> str:
+    """Приводит ключ к единому виду: без 0x, в нижнем регистре"""
+    private_key = private_key.strip()
+    if private_key.startswith('0x'):
+        private_key = private_key[2:]
+    return private_key.lower()
+
+
+def _derive(private_key: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Извлекает адрес из ключа (выполняется в процессе пула)
+
+    Returns:
+        Кортеж (адрес, None) или (None, текст ошибки)
+    """
+    from crypto_utils import verify_address_from_key
+    try:
+        return verify_address_from_key(private_key), None
+    except Exception as e:
+        return None, str(e)
+
+
+class AddressCache:
+    """
+    Кеш соответствия ключ -> адрес на диске
+
+    Сами ключи в файл не попадают: запись хранится под SHA-256 от
+    случайной соли файла и ключа.
+    """
+
+    def __init__(self, path: str = ADDRESS_CACHE_FILE):
+        self.path = path
+        self.salt = os.urandom(16).hex()
+        self.addresses: Dict[str, str] = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Загружает кеш из файла (если файла нет, кеш остается пустым)"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.salt = data['salt']
+            self.addresses = dict(data.get('addresses', {}))
+        except Exception as e:
+            logger.warning(f"⚠ Не удалось прочитать кеш адресов {self.path}: {e}")
+
+    def save(self):
+        """Сохраняет кеш в файл, если в нем появились новые записи"""
+        if not self.dirty:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'salt': self.salt, 'addresses': self.addresses}, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except Exception as e:
+            logger.warning(f"⚠ Не удалось сохранить кеш адресов {self.path}: {e}")
+
+    def key_hash(self, private_key: str) -> str:
+        """Хеш ключа, под которым хранится адрес"""
+        return hashlib.sha256(f"{self.salt}:{_normalize_key(private_key)}".encode()).hexdigest()
+
+    def get(self, private_key: str) -> Optional[str]:
+        return self.addresses.get(self.key_hash(private_key))
+
+    def put(self, private_key: str, address: str):
+        with self._lock:
+            self.addresses[self.key_hash(private_key)] = address
+            self.dirty = True
+
+
+def derive_addresses(private_keys: List[str], cache: AddressCache = None,
+                     workers: int = ADDRESS_DERIVE_WORKERS) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Извлекает адреса для списка ключей: из кеша, а недостающие - в пуле процессов
+
+    Args:
+        private_keys: Приватные ключи (с префиксом 0x или без)
+        cache: Кеш адресов (по умолчанию загружается из ADDRESS_CACHE_FILE)
+        workers: Количество процессов (0 - по числу ядер)
+
+    Returns:
+        Список кортежей (адрес, ошибка) в порядке ключей
+    """
+    if cache is None:
+        cache = AddressCache()
+        cache.load()
+
+    results: List[Tuple[Optional[str], Optional[str]]] = [(None, None)] * len(private_keys)
+    missing = []
+    for index, private_key in enumerate(private_keys):
+        address = cache.get(private_key)
+        if address:
+            results[index] = (address, None)
+        else:
+            missing.append(index)
+
+    if missing:
+        keys = [private_keys[index] for index in missing]
+        workers = workers or os.cpu_count() or 1
+        if len(keys) >= POOL_THRESHOLD and workers > 1:
+            setup_logging()
+            logger.info(f"Извлечение {len(keys)} адресов в {workers} процессах...")
+            chunksize = max(1, len(keys) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                derived = list(executor.map(_derive, keys, chunksize=chunksize))
+        else:
+            derived = [_derive(key) for key in keys]
+
+        for index, private_key, result in zip(missing, keys, derived):
+            results[index] = result
+            if result[0]:
+                cache.put(private_key, result[0])
+        cache.save()
+
+    return results
@@ -4,69 +4,101 @@ API клиент для работы с предикшн маркетом
 import requests
 import time
 import json
-from typing import Dict, List, Optional
-from config import API_BASE_URL, MARKET_ID, WALLET_ADDRESS
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit
+from bet_stream import iter_json_array, slim_bet
+from rate_limiter import rate_limiter, parse_retry_after
+from metrics import api_metrics
+from http_cache import user_stats_cache
+from daily_schedule import daily_schedule, parse_next_claim
+from crypto_utils import sign_message
+from session_registry import session_registry, format_proxy
+from logging_setup import setup_logging
+from config import (
+    API_BASE_URL, SITE_URL, MARKET_ID, WALLET_ADDRESS,
+    MARKET_DISCOVERY_CONCURRENCY, MAX_AVAILABLE_MARKETS, STREAM_CHUNK_SIZE,
+    RATE_LIMIT_MAX_RETRIES
+)
 # Реферальный код зашит в код
 REFERRAL_CODE = "BA08NOBF"
 
+logger = logging.getLogger(__name__)
+
 
 class PredictionMarketAPI:
     def __init__(self, wallet_address: str = None, private_key: str = None, proxy: str = None):
+        setup_logging()
         self.base_url = API_BASE_URL
+        self.last_discovery = None  # Статистика последнего поиска маркетов
         self.wallet_address = wallet_address or WALLET_ADDRESS
         self.private_key = private_key
-        self.session = requests.Session()
-        
-        # Настраиваем прокси если указан
-        if proxy:
-            proxy_dict = self._format_proxy(proxy)
-            if proxy_dict:
-                self.session.proxies.update(proxy_dict)
-        
-        # Устанавливаем заголовки как в браузере
-        self.session.headers.update({
-            'accept': 'application/json, text/plain, */*',
-            'accept-encoding': 'gzip, deflate, br, zstd',
-            'accept-language': 'ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7',
-            'origin': 'https://prediction.boinknfts.club',
-            'referer': 'https://prediction.boinknfts.club/',
-            'sec-ch-ua': '"Not(A:Brand";v="8", "Chromium";v="144", "Google Chrome";v="144"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"',
-            'sec-fetch-dest': 'empty',
-            'sec-fetch-mode': 'cors',
-            'sec-fetch-site': 'cross-site',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36'
-        })
+        self.proxy = proxy
+        
+        # Своя сессия (cookie) на общем для этого прокси пуле соединений
+        self.session = session_registry.get_session(proxy)
+    
+    def _log(self, level: int, message: str):
+        """Пишет сообщение клиента в лог (в консоль - как есть, пока она не отключена панелью)"""
+        logger.log(level, f"[{self.wallet_address}] {message}",
+                   extra={'console': message, 'wallet': self.wallet_address})
     
     def _format_proxy(self, proxy: str) -> dict:
         """Форматирует прокси строку для использования в requests"""
-        if not proxy:
-            return {}
+        return format_proxy(proxy)
+    
+    def _request(self, method: str, url: str, endpoint: str, retry_throttled: bool = True, **kwargs) -> requests.Response:
+        """
+        Выполняет HTTP-запрос через общий ограничитель частоты
+        
+        Перед запросом берется токен из ведра (хост, прокси, класс endpoint'а).
+        На 429/503 ведро замедляется с учетом Retry-After, а запрос повторяется
+        с экспоненциальной задержкой и джиттером. POST повторяется только после 429:
+        503 может прийти, когда сервер уже выполнил запрос.
+        
+        Args:
+            method: HTTP метод
+            url: Адрес запроса
+            endpoint: Имя endpoint'а (bet, market_bets, stats, claim_daily, ...)
+            retry_throttled: Если False, ответ 429/503 возвращается вызывающему коду без повторов
+                (ведро при этом все равно замедляется)
+            **kwargs: Параметры для requests.Session.request
         
-        # Убираем префикс http:// или https:// если есть
-        proxy = proxy.strip()
-        if proxy.startswith('http://'):
-            proxy = proxy[7:]
-        elif proxy.startswith('https://'):
-            proxy = proxy[8:]
-        
-        # Если прокси содержит @, значит есть авторизация
-        if '@' in proxy:
-            # Формат: user:pass@host:port
-            auth_part, server_part = proxy.split('@', 1)
-            user, password = auth_part.split(':', 1)
-            host, port = server_part.split(':', 1)
+        Returns:
+            Ответ сервера
+        """
+        bucket = rate_limiter.bucket(urlsplit(url).netloc, self.proxy, endpoint)
+        attempt = 0
+        while True:
+            bucket.acquire()
+            start_time = time.perf_counter()
+            api_metrics.request_started()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException:
+                api_metrics.record(endpoint, time.perf_counter() - start_time, 'error')
+                raise
+            finally:
+                api_metrics.request_finished()
+            # При потоковом чтении тело еще не загружено - его байты добавит iter_market_bets
+            response_bytes = 0 if kwargs.get('stream') else len(response.content)
+            api_metrics.record(endpoint, time.perf_counter() - start_time, response.status_code, response_bytes)
             
-            proxy_url = f"http://{user}:{password}@{host}:{port}"
-        else:
-            # Формат: host:port
-            proxy_url = f"http://{proxy}"
-        
-        return {
-            'http': proxy_url,
-            'https': proxy_url
-        }
+            if response.status_code not in (429, 503):
+                bucket.on_success()
+                return response
+            
+            # Ведро замедляется и без повтора: иначе ставки разгонялись бы именно тогда, когда сервер их режет
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            rate_limiter.on_throttled(bucket, retry_after)
+            if (not retry_throttled or attempt >= RATE_LIMIT_MAX_RETRIES
+                    or (method == 'POST' and response.status_code != 429)):
+                return response
+            
+            response.close()
+            time.sleep(rate_limiter.backoff_delay(attempt, retry_after))
+            attempt += 1
     
     def _setup_referral(self, referral_code: str):
         """
@@ -77,10 +109,10 @@ class PredictionMarketAPI:
             referral_code: Реферальный код (например, BA08NOBF)
         """
         try:
-            referral_url = f"https://prediction.boinknfts.club/?ref={referral_code}"
+            referral_url = f"{SITE_URL}/?ref={referral_code}"
             
             # Делаем GET запрос к реферальной ссылке для установки cookie
-            response = self.session.get(referral_url, timeout=10)
+            response = self._request('GET', referral_url, 'referral', timeout=10)
             response.raise_for_status()
         except Exception as e:
             # Продолжаем работу, реферальный код может быть необязательным
@@ -118,7 +150,6 @@ class PredictionMarketAPI:
         # Если есть приватный ключ, подписываем запрос
         if self.private_key:
             try:
-                from crypto_utils import sign_message
                 message = json.dumps(payload, separators=(',', ':'))
                 signature = sign_message(message, self.private_key)
                 payload["signature"] = signature
@@ -128,7 +159,7 @@ class PredictionMarketAPI:
         # Пробуем только 2 самых вероятных endpoint'а
         for endpoint in possible_endpoints:
             try:
-                response = self.session.post(endpoint, json=payload, timeout=5)
+                response = self._request('POST', endpoint, 'register', json=payload, timeout=5)
                 if response.status_code == 200:
                     result = response.json()
                     if result.get("success"):
@@ -165,23 +196,24 @@ class PredictionMarketAPI:
         # Если есть приватный ключ, подписываем запрос
         if self.private_key:
             try:
-                from crypto_utils import sign_message
                 # Создаем сообщение для подписи
                 message = f"{self.wallet_address}:{market_id}:{outcome}:{amount}"
                 signature = sign_message(message, self.private_key)
                 payload["signature"] = signature
             except Exception as e:
-                print(f"⚠ Ошибка при подписании запроса: {e}")
+                self._log(logging.WARNING, f"⚠ Ошибка при подписании запроса: {e}")
                 # Продолжаем без подписи, возможно API не требует её
         
         try:
-            response = self.session.post(url, json=payload)
+            # Ставка не повторяется автоматически: повтор мог бы поставить дважды,
+            # решение о новой попытке принимает вызывающий код
+            response = self._request('POST', url, 'bet', retry_throttled=False, json=payload)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Ошибка при размещении ставки: {e}")
+            self._log(logging.ERROR, f"Ошибка при размещении ставки: {e}")
             if hasattr(e, 'response') and e.response is not None:
-                print(f"Ответ сервера: {e.response.text}")
+                self._log(logging.ERROR, f"Ответ сервера: {e.response.text}")
             raise
     
     def get_user_bets(self, wallet_address: str = None) -> List[Dict]:
@@ -198,17 +230,19 @@ class PredictionMarketAPI:
         url = f"{self.base_url}/user/{wallet_address}/bets"
         
         try:
-            response = self.session.get(url)
+            response = self._request('GET', url, 'user_bets')
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Ошибка при получении ставок пользователя: {e}")
+            self._log(logging.ERROR, f"Ошибка при получении ставок пользователя: {e}")
             raise
     
     def get_market_bets(self, market_id: int = None, silent: bool = False) -> List[Dict]:
         """
         Получает список всех ставок на маркете
         
+        Для потоковой обработки без списка в памяти - iter_market_bets.
+        
         Args:
             market_id: ID маркета (по умолчанию из конфига)
             silent: Если True, не выводит ошибки в консоль
@@ -220,7 +254,7 @@ class PredictionMarketAPI:
         url = f"{self.base_url}/market/{market_id}/bets"
         
         try:
-            response = self.session.get(url, timeout=5)
+            response = self._request('GET', url, 'market_bets', timeout=5)
             response.raise_for_status()
             
             # Проверяем, что ответ - валидный JSON
@@ -229,21 +263,63 @@ class PredictionMarketAPI:
                 return data if isinstance(data, list) else []
             except (ValueError, json.JSONDecodeError) as e:
                 if not silent:
-                    print(f"Ошибка при парсинге JSON для маркета {market_id}: {e}")
+                    self._log(logging.ERROR, f"Ошибка при парсинге JSON для маркета {market_id}: {e}")
                 raise
             
         except requests.exceptions.RequestException as e:
             if not silent:
-                print(f"Ошибка при получении ставок маркета {market_id}: {e}")
+                self._log(logging.ERROR, f"Ошибка при получении ставок маркета {market_id}: {e}")
+            raise
+        except (ValueError, json.JSONDecodeError) as e:
+            if not silent:
+                self._log(logging.ERROR, f"Ошибка при парсинге JSON для маркета {market_id}: {e}")
+            raise
+    
+    def iter_market_bets(self, market_id: int = None, silent: bool = False) -> Iterator[Dict]:
+        """
+        Потоково получает ставки маркета, не загружая весь ответ в память
+        
+        У каждой ставки остаются только amount, outcome и поля для дедупликации (id, timestamp, userAddress),
+        поэтому пиковое потребление памяти не зависит от размера маркета.
+        
+        Args:
+            market_id: ID маркета (по умолчанию из конфига)
+            silent: Если True, не выводит ошибки в консоль
+        
+        Yields:
+            Ставки маркета
+        """
+        market_id = market_id or MARKET_ID
+        url = f"{self.base_url}/market/{market_id}/bets"
+        
+        try:
+            with self._request('GET', url, 'market_bets', timeout=5, stream=True) as response:
+                response.raise_for_status()
+                for bet in iter_json_array(self._count_bytes(response, 'market_bets')):
+                    yield slim_bet(bet)
+        except requests.exceptions.RequestException as e:
+            if not silent:
+                self._log(logging.ERROR, f"Ошибка при получении ставок маркета {market_id}: {e}")
             raise
         except (ValueError, json.JSONDecodeError) as e:
             if not silent:
-                print(f"Ошибка при парсинге JSON для маркета {market_id}: {e}")
+                self._log(logging.ERROR, f"Ошибка при парсинге JSON для маркета {market_id}: {e}")
             raise
     
+    @staticmethod
+    def _count_bytes(response: requests.Response, endpoint: str) -> Iterator[bytes]:
+        """Отдает куски потокового ответа и учитывает их размер в метриках"""
+        received = 0
+        try:
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                received += len(chunk)
+                yield chunk
+        finally:
+            api_metrics.add_bytes(endpoint, received)
+    
     def check_daily_cooldown(self, wallet_address: str = None) -> Optional[Dict]:
         """
-        Проверяет, доступен ли дейлик (не в кулдауне)
+        Проверяет, доступен ли дейлик (не в кулдауне), по локальному расписанию без запросов к API
         
         Args:
             wallet_address: Адрес кошелька (по умолчанию из конфига)
@@ -252,18 +328,11 @@ class PredictionMarketAPI:
             None если можно клеймить, иначе словарь с информацией о CD
         """
         wallet_address = wallet_address or self.wallet_address
-        stats = self.get_user_stats(wallet_address)
-        
-        if stats:
-            # Проверяем наличие информации о CD в статистике
-            # Предполагаем, что если есть поле lastDailyClaim или cooldown, проверяем его
-            if 'lastDailyClaim' in stats:
-                # Здесь можно добавить логику проверки времени последнего клейма
-                pass
-            # Если нет информации о CD, значит можно клеймить
+        next_claim_at = daily_schedule.next_claim_at(wallet_address)
+        now = time.time()
+        if next_claim_at is None or next_claim_at <= now:
             return None
-        
-        return None
+        return {'next_claim_at': next_claim_at, 'seconds_left': next_claim_at - now}
     
     def claim_daily(self, wallet_address: str = None) -> Dict:
         """
@@ -277,7 +346,7 @@ class PredictionMarketAPI:
         """
         wallet_address = wallet_address or self.wallet_address
         
-        # Проверяем CD перед клеймом
+        # Проверяем CD перед клеймом (по локальному расписанию, без запроса статистики)
         cd_info = self.check_daily_cooldown(wallet_address)
         if cd_info is not None:
             raise Exception("Дейлик в кулдауне, нельзя клеймить")
@@ -290,7 +359,6 @@ class PredictionMarketAPI:
         headers = {}
         if self.private_key:
             try:
-                from crypto_utils import sign_message
                 # Создаем сообщение для подписи (стандартизированный JSON)
                 message = json.dumps(payload, separators=(',', ':'))
                 signature = sign_message(message, self.private_key)
@@ -299,10 +367,12 @@ class PredictionMarketAPI:
                     'X-Address': wallet_address
                 }
             except Exception as e:
-                print(f"⚠ Ошибка при подписании запроса: {e}")
+                self._log(logging.WARNING, f"⚠ Ошибка при подписании запроса: {e}")
         
         try:
-            response = self.session.post(url, json=payload if payload else None, headers=headers)
+            # 429 у дейлика обычно означает кулдаун, поэтому не повторяем запрос
+            response = self._request('POST', url, 'claim_daily', retry_throttled=False,
+                                     json=payload if payload else None, headers=headers)
             
             # Проверяем, не в CD ли мы или уже клеймлен
             if response.status_code == 400 or response.status_code == 429:
@@ -315,14 +385,17 @@ class PredictionMarketAPI:
                 
                 # Проверяем различные варианты сообщений о кулдауне
                 if 'cooldown' in error_text or 'wait' in error_text or 'too soon' in error_text:
+                    daily_schedule.record_cooldown(wallet_address, parse_next_claim(response_json, response.headers))
                     raise Exception("Дейлик в кулдауне, нужно подождать")
                 
                 # Проверяем, что дейлик уже клеймлен сегодня
                 if 'already claimed' in error_text or 'come back tomorrow' in error_text:
+                    daily_schedule.record_cooldown(wallet_address, parse_next_claim(response_json, response.headers))
                     error_msg = response_json.get('error', 'Already claimed today')
                     raise Exception(f"Дейлик уже клеймлен сегодня: {error_msg}")
             
             response.raise_for_status()
+            daily_schedule.record_claim(wallet_address)
             return response.json()
         except requests.exceptions.RequestException as e:
             if hasattr(e, 'response') and e.response is not None:
@@ -331,15 +404,17 @@ class PredictionMarketAPI:
                     response_json = e.response.json()
                     # Проверяем, что дейлик уже клеймлен
                     if 'already claimed' in error_text or 'come back tomorrow' in error_text:
+                        daily_schedule.record_cooldown(wallet_address, parse_next_claim(response_json, e.response.headers))
                         error_msg = response_json.get('error', 'Already claimed today')
                         raise Exception(f"Дейлик уже клеймлен сегодня: {error_msg}")
                 except:
                     pass
                 if 'cooldown' in error_text or 'wait' in error_text or 'too soon' in error_text:
+                    daily_schedule.record_cooldown(wallet_address, parse_next_claim(None, e.response.headers))
                     raise Exception("Дейлик в кулдауне, нужно подождать")
-            print(f"Ошибка при клейме дейлика: {e}")
+            self._log(logging.ERROR, f"Ошибка при клейме дейлика: {e}")
             if hasattr(e, 'response') and e.response is not None:
-                print(f"Ответ сервера: {e.response.text}")
+                self._log(logging.ERROR, f"Ответ сервера: {e.response.text}")
             raise
     
     def get_market_info(self, market_id: int = None) -> Dict:
@@ -350,44 +425,104 @@ class PredictionMarketAPI:
         url = f"{self.base_url}/market/{market_id}"
         
         try:
-            response = self.session.get(url)
+            response = self._request('GET', url, 'market_info')
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException:
             # Если endpoint не существует, возвращаем None
             return None
     
-    def get_available_markets(self, min_id: int = 1, max_id: int = 200) -> List[int]:
+    def discover_markets(self, market_ids: Iterable[int], limit: int = MAX_AVAILABLE_MARKETS,
+                         concurrency: int = None, on_result: Callable[[int, Optional[int]], None] = None,
+                         verbose: bool = True) -> Dict[int, int]:
         """
-        Получает список доступных маркетов, проверяя диапазон ID
+        Параллельно проверяет ID маркетов и останавливается, как только найдено limit доступных
         
         Args:
-            min_id: Минимальный ID маркета для проверки
-            max_id: Максимальный ID маркета для проверки
+            market_ids: ID маркетов для проверки (в порядке приоритета)
+            limit: Сколько доступных маркетов нужно найти
+            concurrency: Количество одновременных проверок (по умолчанию из конфига)
+            on_result: Вызывается для каждого проверенного ID с количеством ставок (None - недоступен)
+            verbose: Если False, не выводит прогресс в консоль
         
         Returns:
-            Список доступных ID маркетов
+            Словарь {ID маркета: количество ставок} для найденных маркетов
         """
-        available_markets = []
+        concurrency = max(1, concurrency or MARKET_DISCOVERY_CONCURRENCY)
+        market_ids = iter(market_ids)
+        found = {}
         checked = 0
+        start_time = time.time()
         
-        # Проверяем каждый маркет в диапазоне (тихо, без вывода ошибок)
-        for market_id in range(min_id, max_id + 1):
-            checked += 1
-            try:
-                bets = self.get_market_bets(market_id, silent=True)
-                if bets is not None and isinstance(bets, list):
-                    available_markets.append(market_id)
-                    if len(available_markets) >= 20:  # Ограничиваем количество найденных маркетов
-                        break
-            except:
-                continue
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="market-probe")
+        pending = {}
+        try:
+            # Держим в работе не больше concurrency проверок, новые ID подаем по мере освобождения
+            for market_id in market_ids:
+                pending[executor.submit(self._probe_market, market_id)] = market_id
+                if len(pending) >= concurrency:
+                    break
             
-            # Показываем прогресс каждые 50 маркетов
-            if checked % 50 == 0:
-                print(f"  Проверено {checked} маркетов, найдено доступных: {len(available_markets)}")
+            while pending and len(found) < limit:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    market_id = pending.pop(future)
+                    checked += 1
+                    bet_count = future.result()
+                    if bet_count is not None:
+                        found[market_id] = bet_count
+                    if on_result:
+                        on_result(market_id, bet_count)
+                    
+                    # Показываем прогресс каждые 50 маркетов
+                    if verbose and checked % 50 == 0:
+                        self._log(logging.INFO, f"  Проверено {checked} маркетов, найдено доступных: {len(found)}")
+                
+                if len(found) >= limit:
+                    break
+                
+                for market_id in market_ids:
+                    pending[executor.submit(self._probe_market, market_id)] = market_id
+                    if len(pending) >= concurrency:
+                        break
+        finally:
+            # Не ждем оставшиеся проверки: их результаты уже не нужны
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+        
+        elapsed = time.time() - start_time
+        self.last_discovery = {'checked': checked, 'found': len(found), 'elapsed': elapsed}
+        if verbose:
+            self._log(logging.INFO, f"  Поиск маркетов: проверено {checked}, найдено {len(found)} за {elapsed:.2f} сек")
+        
+        # При параллельной проверке могло найтись чуть больше limit маркетов - оставляем первые по ID
+        return {market_id: found[market_id] for market_id in sorted(found)[:limit]}
+    
+    def _probe_market(self, market_id: int) -> Optional[int]:
+        """Возвращает количество ставок на маркете или None, если маркет недоступен"""
+        try:
+            # Считаем ставки потоково, не сохраняя их в памяти
+            return sum(1 for _ in self.iter_market_bets(market_id, silent=True))
+        except Exception:
+            return None
+    
+    def get_available_markets(self, min_id: int = 1, max_id: int = 200, concurrency: int = None,
+                              on_result: Callable[[int, Optional[int]], None] = None) -> List[int]:
+        """
+        Получает список доступных маркетов, параллельно проверяя диапазон ID
+        
+        Args:
+            min_id: Минимальный ID маркета для проверки
+            max_id: Максимальный ID маркета для проверки
+            concurrency: Количество одновременных проверок (по умолчанию из конфига)
+            on_result: Вызывается для каждого проверенного ID (см. discover_markets)
         
-        return available_markets
+        Returns:
+            Список доступных ID маркетов
+        """
+        markets = self.discover_markets(range(min_id, max_id + 1), MAX_AVAILABLE_MARKETS, concurrency, on_result)
+        return list(markets)
     
     def is_market_available(self, market_id: int) -> bool:
         """
@@ -418,19 +553,27 @@ class PredictionMarketAPI:
         wallet_address = wallet_address or self.wallet_address
         url = f"{self.base_url}/user/{wallet_address}/stats"
         
+        cache_key = wallet_address.lower()
+        
         try:
-            # Делаем запрос с заголовками, отключающими кеш, чтобы всегда получать свежие данные
+            # no-cache заставляет промежуточные кеши сверяться с сервером, а ETag/Last-Modified
+            # позволяют серверу ответить 304 без тела, если статистика не изменилась
             headers = {
                 'Cache-Control': 'no-cache',
                 'Pragma': 'no-cache'
             }
-            response = self.session.get(url, headers=headers)
+            headers.update(user_stats_cache.conditional_headers(cache_key))
+            response = self._request('GET', url, 'stats', headers=headers)
             
-            # Если получили 304, игнорируем и делаем запрос заново
+            # 304 - статистика не изменилась, берем сохраненный ответ
             if response.status_code == 304:
-                # Убираем If-None-Match и делаем запрос заново
+                cached = user_stats_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+                # Сохраненного ответа нет - запрашиваем заново без валидаторов
                 headers['If-None-Match'] = ''
-                response = self.session.get(url, headers=headers)
+                headers.pop('If-Modified-Since', None)
+                response = self._request('GET', url, 'stats', headers=headers)
             
             response.raise_for_status()
             
@@ -441,7 +584,10 @@ class PredictionMarketAPI:
                 # Если не JSON, возвращаем пустой словарь
                 return {}
             
-            return data if isinstance(data, dict) else {}
+            if not isinstance(data, dict):
+                return {}
+            user_stats_cache.store(cache_key, response.headers, data)
+            return data
         except requests.exceptions.RequestException:
             # Не выводим ошибку, просто возвращаем пустой словарь
             return {}
@@ -463,9 +609,9 @@ class PredictionMarketAPI:
         url = f"{self.base_url}/user/{wallet_address}/achievements"
         
         try:
-            response = self.session.get(url)
+            response = self._request('GET', url, 'achievements')
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"Ошибка при получении достижений пользователя: {e}")
+            self._log(logging.ERROR, f"Ошибка при получении достижений пользователя: {e}")
             raise
@@ -0,0 +1,3 @@
+"""
+Бенчмарки производительности бота (запуск: python -m benchmarks.<имя>)
+"""
@@ -0,0 +1,98 @@
+"""
+Бенчмарк: журнал ставок с групповым fsync против fsync на каждую запись, и пересчет итогов
+
+Запись: несколько потоков одновременно пишут ставки, каждый ждет, пока его
+запись окажется на диске. Пересчет: итоги по кошелькам и маркетам по
+журналу из миллиона записей.
+
+Запуск:
+    python -m benchmarks.bench_bet_journal
+"""
+import os
+import json
+import time
+import random
+import tempfile
+import threading
+from bet_journal import BetJournal, replay
+
+WRITER_THREADS = 16
+ENTRIES_PER_THREAD = 200
+REPLAY_ENTRIES = 1_000_000
+WALLETS = 1000
+MARKETS = 200
+
+
+def fsync_per_entry(path: str, threads: int, per_thread: int) -> float:
+    """Как без журнала: каждая запись - отдельный write + fsync под общей блокировкой"""
+    lock = threading.Lock()
+    with open(path, 'a', encoding='utf-8') as f:
+        def worker(index: int):
+            for i in range(per_thread):
+                line = json.dumps({'wallet': f"0x{index:040x}", 'market': i % MARKETS, 'outcome': 'YES',
+                                   'amount': 1.0, 'ok': True}, separators=(',', ':'))
+                with lock:
+                    f.write(line + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+        return _run_threads(worker, threads)
+
+
+def group_commit(path: str, threads: int, per_thread: int) -> (float, int):
+    """BetJournal: потоки ждут fsync своей группы"""
+    journal = BetJournal(path, wait=True)
+
+    def worker(index: int):
+        for i in range(per_thread):
+            journal.record(f"0x{index:040x}", i % MARKETS, 'YES', 1.0, True)
+    elapsed = _run_threads(worker, threads)
+    journal.close()
+    return elapsed, journal.commits
+
+
+def _run_threads(worker, threads: int) -> float:
+    pool = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def make_journal(path: str, entries: int):
+    """Журнал со случайными ставками (пишется напрямую, без fsync)"""
+    rng = random.Random(42)
+    wallets = [f"0x{rng.getrandbits(160):040x}" for _ in range(WALLETS)]
+    now = time.time()
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(entries):
+            record = {'ts': round(now + i * 0.01, 3), 'wallet': rng.choice(wallets), 'market': rng.randint(1, MARKETS),
+                      'outcome': rng.choice(('YES', 'NO')), 'amount': round(rng.uniform(1, 10), 2), 'ok': rng.random() > 0.05}
+            if not record['ok']:
+                record['error'] = "429 Too Many Requests"
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+
+def main():
+    total = WRITER_THREADS * ENTRIES_PER_THREAD
+    # Временная папка в текущей, а не в /tmp: там часто tmpfs, где fsync ничего не стоит
+    with tempfile.TemporaryDirectory(dir=".") as directory:
+        print(f"Запись {total} ставок из {WRITER_THREADS} потоков (каждая ставка ждет fsync):")
+        elapsed = fsync_per_entry(os.path.join(directory, 'naive.jsonl'), WRITER_THREADS, ENTRIES_PER_THREAD)
+        print(f"  fsync на запись:   {elapsed:8.2f} с, {total / elapsed:10.0f} записей/с, fsync: {total}")
+        elapsed, commits = group_commit(os.path.join(directory, 'group.jsonl'), WRITER_THREADS, ENTRIES_PER_THREAD)
+        print(f"  групповой fsync:   {elapsed:8.2f} с, {total / elapsed:10.0f} записей/с, fsync: {commits}")
+
+        path = os.path.join(directory, 'replay.jsonl')
+        make_journal(path, REPLAY_ENTRIES)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        start = time.perf_counter()
+        totals = replay([path])
+        elapsed = time.perf_counter() - start
+        print(f"\nПересчет {totals.entries} записей ({size_mb:.0f} МБ): {elapsed:.2f} с, "
+              f"{totals.entries / elapsed:,.0f} записей/с; кошельков {len(totals.wallets)}, маркетов {len(totals.markets)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Бенчмарк: ставки маркета списком словарей против колонок NumPy (MarketColumns)
+
+Для маркетов до 100 000 ставок сравниваются время построения, память,
+занятая снимком, и время запросов: суммы YES/NO, перекос и объем за последний час.
+Отдельно - повторная загрузка маркета, в котором появилось NEW_BETS новых ставок:
+колонки дописывают только их.
+
+Запуск:
+    python -m benchmarks.bench_market_columns
+"""
+import gc
+import time
+import statistics
+import tracemalloc
+from bet_stream import iter_json_array, slim_bet
+from market_columns import MarketColumns, bet_timestamp
+from benchmarks.bench_stream_parse import make_body, chunks
+
+MARKET_SIZES = [1_000, 10_000, 100_000]
+QUERY_REPEATS = 20
+WINDOW_SECONDS = 3600
+NEW_BETS = 100
+
+
+def build_dicts(body: bytes):
+    """Снимок как раньше: потоковый разбор в список облегченных словарей"""
+    return [slim_bet(bet) for bet in iter_json_array(chunks(body))]
+
+
+def build_columns(body: bytes):
+    """Снимок колонками: ставки сразу раскладываются по массивам"""
+    return MarketColumns.from_bets(iter_json_array(chunks(body)))
+
+
+def dict_queries(bets, now: float):
+    """Суммы, перекос и объем за окно циклами Python"""
+    yes_amount = sum(float(bet.get('amount', 0)) for bet in bets if bet.get('outcome', '').upper() == 'YES')
+    no_amount = sum(float(bet.get('amount', 0)) for bet in bets if bet.get('outcome', '').upper() == 'NO')
+    total = yes_amount + no_amount
+    imbalance = (yes_amount - no_amount) / total if total > 0 else 0.0
+    since = now - WINDOW_SECONDS
+    recent_yes = recent_no = 0.0
+    for bet in bets:
+        if bet_timestamp(bet) >= since:
+            outcome = bet.get('outcome', '').upper()
+            if outcome == 'YES':
+                recent_yes += float(bet.get('amount', 0))
+            elif outcome == 'NO':
+                recent_no += float(bet.get('amount', 0))
+    return yes_amount, no_amount, imbalance, recent_yes, recent_no
+
+
+def column_queries(columns: MarketColumns, now: float):
+    """То же самое векторно"""
+    yes_amount, no_amount = columns.totals()
+    recent_yes, recent_no = columns.recent_volume(WINDOW_SECONDS, now)
+    return yes_amount, no_amount, columns.imbalance(), recent_yes, recent_no
+
+
+def update_time(body: bytes, size: int) -> float:
+    """Время дописывания NEW_BETS новых ставок в колонки маркета (без разбора JSON)"""
+    bets = list(iter_json_array(chunks(body)))
+    timings = []
+    for _ in range(3):
+        columns = MarketColumns.from_bets(bets[:size])
+        start = time.perf_counter()
+        added = columns.update(bets[size:])
+        timings.append(time.perf_counter() - start)
+        assert added == NEW_BETS and len(columns) == size + NEW_BETS
+    return statistics.median(timings)
+
+
+def retained_mb(build, body: bytes) -> float:
+    """Память, которую занимает построенный снимок (МБ)"""
+    gc.collect()
+    tracemalloc.start()
+    snapshot = build(body)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del snapshot
+    return current / 1024 / 1024
+
+
+def median_time(func, *args, repeats: int = QUERY_REPEATS) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    print(f"{'Ставок':>9} | {'Способ':<10} {'Построение, с':>14} {'Память, МБ':>11} {'Запросы, мс':>12}")
+    print('-' * 64)
+    for size in MARKET_SIZES:
+        body = make_body(size)
+        # Окно "последний час" захватывает последние 3600 ставок (по одной в секунду)
+        now = 1_760_000_000 + size
+        results = []
+        for name, build, queries in (("словари", build_dicts, dict_queries),
+                                     ("колонки", build_columns, column_queries)):
+            build_time = median_time(build, body, repeats=3)
+            memory = retained_mb(build, body)
+            snapshot = build(body)
+            query_time = median_time(queries, snapshot, now)
+            results.append(queries(snapshot, now))
+            print(f"{size:>9} | {name:<10} {build_time:>14.3f} {memory:>11.2f} {query_time * 1000:>12.3f}")
+        assert all(abs(a - b) < 1e-6 * max(1.0, abs(a)) for a, b in zip(*results)), results
+        print(f"{'':>9} | +{NEW_BETS} новых ставок в колонки: {update_time(make_body(size + NEW_BETS), size) * 1000:.3f} мс")
+        print('-' * 64)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Сквозной бенчмарк конвейера ставок на локальном тестовом сервере (mock_server.py)
+
+Для флотов из 10, 100 и 1000 кошельков прогоняются:
+    strategy - WalletTrader.make_bet_with_strategy по одной ставке на кошелек
+    bet      - режим ставок (mode_bet)
+    daily    - режим дейлика (mode_daily)
+    stats    - режим статистики (mode_stats)
+
+Для каждого прогона считаются время, ставок/сек, кошельков/сек и запросов на ставку.
+Результаты сохраняются в benchmarks/results/pipeline_<время>.json.
+
+Запуск:
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --fleets 10,100 --modes strategy,bet --latency 0.02
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
+import tempfile
+import subprocess
+import contextlib
+from datetime import datetime
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_server import MockMarketServer, MockServerConfig  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+MODES = ('strategy', 'bet', 'daily', 'stats')
+
+
+class _NoSleep:
+    """Модуль time без пауз: паузы между кошельками в режимах не входят в замер"""
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+    @staticmethod
+    def sleep(seconds):
+        pass
+
+
+def _configure_environment(server: MockMarketServer, keep_rate_limits: bool):
+    """Направляет клиент на тестовый сервер (до первого импорта config)"""
+    os.environ['API_BASE_URL'] = server.api_url
+    os.environ['SITE_URL'] = server.url
+    os.environ['MIN_BET_INTERVAL_SECONDS'] = '0'
+    os.environ['MAX_BET_INTERVAL_SECONDS'] = '0'
+    if not keep_rate_limits:
+        # Без прокси все кошельки делят одно ведро, поэтому лимиты снимаются,
+        # чтобы мерить сам конвейер, а не настройку RATE_LIMIT_*
+        os.environ['RATE_LIMIT_READ_PER_SEC'] = '1000000'
+        os.environ['RATE_LIMIT_WRITE_PER_SEC'] = '1000000'
+        os.environ['RATE_LIMIT_BURST'] = '1000000'
+
+
+def _make_fleet(size: int) -> List:
+    """Создает флот кошельков с детерминированными ключами (свои для каждого размера флота)"""
+    from wallet_manager import WalletProxy
+    from address_cache import derive_addresses
+
+    private_keys = ['0x' + hashlib.sha256(f"bench-pipeline-{size}-{i}".encode()).hexdigest() for i in range(size)]
+    fleet = []
+    for private_key, (address, error) in zip(private_keys, derive_addresses(private_keys)):
+        if error:
+            raise RuntimeError(f"Не удалось получить адрес: {error}")
+        fleet.append(WalletProxy(address, private_key, None))
+    return fleet
+
+
+def _run_strategy(fleet: List, markets: List[int]):
+    from trader import WalletTrader
+    traders = [WalletTrader(wallet_proxy, markets) for wallet_proxy in fleet]
+    for trader in traders:
+        trader.make_bet_with_strategy(skip_interval_check=True)
+
+
+def _run_mode(mode: str, fleet: List, markets: List[int]):
+    import modes
+    if mode == 'bet':
+        modes.mode_bet(fleet, markets)
+    elif mode == 'daily':
+        modes.mode_daily(fleet)
+    elif mode == 'stats':
+        modes.mode_stats(fleet)
+
+
+def run_scenario(mode: str, fleet: List, markets: List[int]) -> Dict:
+    """
+    Прогоняет один режим на флоте и собирает результат
+
+    Returns:
+        Словарь с временем, пропускной способностью и запросами по endpoint'ам
+    """
+    import modes
+    from metrics import api_metrics
+    from market_cache import market_bets_cache
+    from market_columns import market_columns_store
+    from logging_setup import flush_logging
+
+    market_bets_cache.invalidate()
+    market_columns_store.reset()
+    api_metrics.reset()
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            modes_time, modes.time = modes.time, _NoSleep()
+            start = time.perf_counter()
+            try:
+                if mode == 'strategy':
+                    _run_strategy(fleet, markets)
+                else:
+                    _run_mode(mode, fleet, markets)
+            finally:
+                elapsed = time.perf_counter() - start
+                modes.time = modes_time
+            # Статусы пишет фоновый поток лога - дописываем их, пока вывод перенаправлен
+            flush_logging()
+
+    snapshot = api_metrics.snapshot()
+    endpoints = snapshot['endpoints']
+    bets = endpoints.get('bet', {}).get('statuses', {}).get('200', 0)
+    requests_total = snapshot['total_requests']
+    return {
+        'wallets': len(fleet),
+        'seconds': elapsed,
+        'bets': bets,
+        'bets_per_second': bets / elapsed if elapsed > 0 else 0.0,
+        'wallets_per_second': len(fleet) / elapsed if elapsed > 0 else 0.0,
+        'requests': requests_total,
+        'requests_per_second': requests_total / elapsed if elapsed > 0 else 0.0,
+        'requests_per_bet': requests_total / bets if bets else None,
+        'requests_by_endpoint': {name: data['count'] for name, data in endpoints.items()},
+        'errors': sum(
+            count for data in endpoints.values()
+            for status, count in data['statuses'].items()
+            if status == 'error' or status.startswith('5') or status == '429'
+        ),
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+    except Exception:
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сквозной бенчмарк конвейера ставок на тестовом сервере")
+    parser.add_argument('--fleets', default='10,100,1000', help='Размеры флотов через запятую')
+    parser.add_argument('--modes', default=','.join(MODES), help=f"Режимы через запятую ({', '.join(MODES)})")
+    parser.add_argument('--markets', type=int, default=20, help='Количество маркетов на сервере')
+    parser.add_argument('--market-size', type=int, default=1000, help='Начальное количество ставок на маркете')
+    parser.add_argument('--latency', type=float, default=0.0, help='Задержка ответа сервера, сек')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Доля ответов 500')
+    parser.add_argument('--keep-rate-limits', action='store_true', help='Не снимать лимиты RATE_LIMIT_*')
+    parser.add_argument('--output', default=None, help='Файл для результатов (JSON)')
+    args = parser.parse_args()
+
+    fleets = [int(size) for size in args.fleets.split(',') if size]
+    modes = [mode for mode in args.modes.split(',') if mode]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"Неизвестные режимы: {', '.join(sorted(unknown))}")
+
+    server = MockMarketServer(
+        markets=args.markets, market_size=args.market_size,
+        config=MockServerConfig(latency=args.latency, error_rate=args.error_rate)
+    ).start()
+    markets = sorted(server.state.markets)
+    _configure_environment(server, args.keep_rate_limits)
+
+    output = os.path.abspath(args.output) if args.output else None
+    # Логи, метрики режимов, индекс маркетов и кеш адресов пишутся во временную папку
+    workdir = tempfile.mkdtemp(prefix='bench_pipeline_')
+    os.chdir(workdir)
+
+    results = []
+    try:
+        for size in fleets:
+            fleet = _make_fleet(size)
+            for mode in modes:
+                result = run_scenario(mode, fleet, markets)
+                result['mode'] = mode
+                results.append(result)
+                requests_per_bet = f"{result['requests_per_bet']:.2f}" if result['requests_per_bet'] else '-'
+                print(f"{mode:<9} {size:>5} кошельков: {result['seconds']:>8.2f} с, "
+                      f"ставок/сек {result['bets_per_second']:>8.1f}, кошельков/сек {result['wallets_per_second']:>8.1f}, "
+                      f"запросов на ставку {requests_per_bet:>6}, ошибок {result['errors']}")
+    finally:
+        server.stop()
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {
+            'fleets': fleets,
+            'modes': modes,
+            'markets': args.markets,
+            'market_size': args.market_size,
+            'latency': args.latency,
+            'error_rate': args.error_rate,
+            'keep_rate_limits': args.keep_rate_limits,
+        },
+        'results': results,
+    }
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены: {output}")
+
+
+if __name__ == "__main__":
+    main()
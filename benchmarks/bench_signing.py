@@ -0,0 +1,54 @@
+"""
+Бенчмарк: подпись сообщений с созданием аккаунта на каждый вызов против кеша аккаунтов
+
+Запуск:
+    python -m benchmarks.bench_signing [количество_кошельков] [подписей_на_кошелек]
+"""
+import os
+import sys
+import time
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from crypto_utils import sign_message, clear_signer_cache
+
+
+def sign_uncached(message: str, private_key: str) -> str:
+    """Старое поведение sign_message: Account.from_key на каждую подпись"""
+    if private_key.startswith('0x'):
+        private_key = private_key[2:]
+    account = Account.from_key(private_key)
+    return account.sign_message(encode_defunct(text=message)).signature.hex()
+
+
+def run(sign, keys, rounds: int) -> float:
+    """Подписывает по rounds сообщений каждым ключом, возвращает подписей в секунду"""
+    start = time.perf_counter()
+    for round_num in range(rounds):
+        for i, key in enumerate(keys):
+            sign(f"0xwallet{i}:109:YES:0.{round_num}", key)
+    elapsed = time.perf_counter() - start
+    return len(keys) * rounds / elapsed
+
+
+def main():
+    wallets = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    keys = [os.urandom(32).hex() for _ in range(wallets)]
+
+    # Подписи должны совпадать
+    assert sign_uncached("check", keys[0]) == sign_message("check", keys[0])
+    clear_signer_cache()
+
+    before = run(sign_uncached, keys, rounds)
+    cold = run(sign_message, keys, 1)  # Первый проход заполняет кеш
+    after = run(sign_message, keys, rounds)
+
+    print(f"Кошельков: {wallets}, подписей на кошелек: {rounds}")
+    print(f"  Без кеша (from_key на каждую подпись): {before:>10.0f} подписей/сек")
+    print(f"  С кешем, первый проход:                {cold:>10.0f} подписей/сек")
+    print(f"  С кешем, повторные подписи:            {after:>10.0f} подписей/сек")
+    print(f"  Ускорение: x{after / before:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Бенчмарк времени запуска: от старта процесса до меню и до первого HTTP-запроса
+
+Запуск:
+    python -m benchmarks.bench_startup [повторов]
+"""
+import os
+import sys
+import time
+import json
+import statistics
+import tempfile
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MENU_MARKER = "Ваш выбор".encode('utf-8')
+
+# Дочерний процесс проходит путь main.py -> режим статистики -> первый запрос
+FIRST_REQUEST_SCRIPT = """
+import sys
+from mode_manager import ModeManager
+from wallet_manager import WalletProxy
+ModeManager()
+from modes import mode_stats
+import api_client
+api_client.API_BASE_URL = sys.argv[1]
+mode_stats([WalletProxy('0x' + '1' * 40)])
+"""
+
+
+class _FirstRequestHandler(BaseHTTPRequestHandler):
+    """Запоминает время прихода первого запроса и отвечает пустой статистикой"""
+    first_request_at = None
+
+    def do_GET(self):
+        if _FirstRequestHandler.first_request_at is None:
+            _FirstRequestHandler.first_request_at = time.perf_counter()
+        body = b'{"success":true,"stats":{"xp":0}}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def time_to_menu() -> float:
+    """Запускает main.py и ждет появления приглашения меню"""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-u', 'main.py'], cwd=ROOT,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    output = b''
+    while MENU_MARKER not in output:
+        chunk = process.stdout.read1(4096)
+        if not chunk:
+            raise RuntimeError("main.py завершился, не показав меню")
+        output += chunk
+    elapsed = time.perf_counter() - start
+    process.communicate(b'0\n', timeout=30)
+    return elapsed
+
+
+def time_to_first_request(server: ThreadingHTTPServer) -> float:
+    """Запускает режим статистики и ждет первый запрос к локальному серверу"""
+    _FirstRequestHandler.first_request_at = None
+    url = f"http://127.0.0.1:{server.server_address[1]}/api"
+    # Метрики режима пишем во временную папку, чтобы не засорять проект
+    env = dict(os.environ, METRICS_DIR=tempfile.mkdtemp(prefix='bench_metrics_'))
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-c', FIRST_REQUEST_SCRIPT, url], cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60
+    )
+    if _FirstRequestHandler.first_request_at is None:
+        raise RuntimeError("Запрос до сервера не дошел")
+    return _FirstRequestHandler.first_request_at - start
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _FirstRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        results = {
+            'start_to_menu': [time_to_menu() for _ in range(repeats)],
+            'start_to_first_request': [time_to_first_request(server) for _ in range(repeats)],
+        }
+    finally:
+        server.shutdown()
+
+    print(f"Повторов: {repeats}")
+    for name, values in results.items():
+        print(f"  {name:<24} медиана {statistics.median(values) * 1000:>7.0f} мс, "
+              f"мин {min(values) * 1000:>7.0f} мс, макс {max(values) * 1000:>7.0f} мс")
+    print(json.dumps({name: statistics.median(values) for name, values in results.items()}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Бенчмарк: обычный разбор ставок маркета (response.json()) против потокового
+
+Запуск:
+    python -m benchmarks.bench_stream_parse
+"""
+import gc
+import json
+import random
+import time
+import tracemalloc
+from bet_stream import iter_json_array, slim_bet
+from config import STREAM_CHUNK_SIZE
+
+MARKET_SIZES = [1_000, 10_000, 100_000, 300_000]
+
+
+def make_body(count: int) -> bytes:
+    """Генерирует тело ответа /market/{id}/bets с полями как у настоящего API"""
+    bets = []
+    for i in range(count):
+        bets.append({
+            'id': i,
+            'marketId': 109,
+            'userAddress': '0x' + ''.join(random.choice('0123456789abcdef') for _ in range(40)),
+            'amount': round(random.uniform(0.01, 1.0), 2),
+            'outcome': random.choice(['YES', 'NO']),
+            'timestamp': 1_760_000_000 + i,
+            'createdAt': '2026-01-01T00:00:00.000Z',
+        })
+    return json.dumps(bets).encode('utf-8')
+
+
+def chunks(body: bytes):
+    """Имитирует response.iter_content()"""
+    for i in range(0, len(body), STREAM_CHUNK_SIZE):
+        yield body[i:i + STREAM_CHUNK_SIZE]
+
+
+def full_parse(body: bytes):
+    """Как get_market_bets(): весь ответ целиком в список словарей, затем сумма"""
+    text = body.decode('utf-8')  # response.json() сначала декодирует response.text
+    bets = json.loads(text)
+    yes_amount = sum(float(bet.get('amount', 0)) for bet in bets if bet.get('outcome', '').upper() == 'YES')
+    return len(bets), yes_amount
+
+
+def stream_list(body: bytes):
+    """Потоковый разбор, но облегченные ставки все равно собираются в список"""
+    bets = [slim_bet(bet) for bet in iter_json_array(chunks(body))]
+    yes_amount = sum(float(bet.get('amount', 0)) for bet in bets if bet.get('outcome', '').upper() == 'YES')
+    return len(bets), yes_amount
+
+
+def stream_sum(body: bytes):
+    """iter_market_bets(): сумма считается на лету, ставки не хранятся"""
+    count = 0
+    yes_amount = 0.0
+    for bet in iter_json_array(chunks(body)):
+        count += 1
+        if bet.get('outcome', '').upper() == 'YES':
+            yes_amount += float(bet.get('amount', 0))
+    return count, yes_amount
+
+
+def measure(func, body: bytes):
+    """Возвращает (время в секундах, пиковая память в МБ, результат)"""
+    # Время меряем отдельно: tracemalloc сильно замедляет выделение памяти
+    gc.collect()
+    start = time.perf_counter()
+    result = func(body)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    func(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, result
+
+
+def main():
+    print(f"{'Ставок':>9} {'Ответ, МБ':>10} | {'Способ':<22} {'Время, с':>9} {'Пик памяти, МБ':>15}")
+    print('-' * 72)
+    for size in MARKET_SIZES:
+        body = make_body(size)
+        expected = None
+        for name, func in (("response.json()", full_parse),
+                           ("поток -> список", stream_list),
+                           ("поток -> сумма", stream_sum)):
+            elapsed, peak, result = measure(func, body)
+            if expected is None:
+                expected = result
+            assert result[0] == expected[0] and abs(result[1] - expected[1]) < 1e-6
+            print(f"{size:>9} {len(body) / 1024 / 1024:>10.1f} | {name:<22} {elapsed:>9.3f} {peak:>15.1f}")
+        print('-' * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+Журнал ставок: только дописываемый JSON Lines с групповым fsync и быстрый пересчет итогов по нему
+
+Запуск пересчета:
+    python -m bet_journal [файл ...]
+"""
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import argparse
+import threading
+from typing import Dict, Iterable, List, Optional
+from config import BET_JOURNAL_FILE, BET_JOURNAL_COMMIT_MS, BET_JOURNAL_WAIT
+
+logger = logging.getLogger(__name__)
+
+# Максимум записей в одной группе (одна запись на диск и один fsync)
+MAX_BATCH = 4096
+
+# Сколько строк разбирать за один вызов json.loads при пересчете
+REPLAY_CHUNK_LINES = 65536
+
+
+class _Entry:
+    __slots__ = ('line', 'done')
+
+    def __init__(self, line: str, done: Optional[threading.Event]):
+        self.line = line
+        self.done = done
+
+
+class BetJournal:
+    """
+    Журнал размещенных ставок
+
+    Запись кладется в очередь, фоновый поток забирает все записи, накопившиеся
+    за время предыдущего fsync (и еще BET_JOURNAL_COMMIT_MS, если задано),
+    дописывает их в файл одной записью и делает один fsync на всю группу.
+    Чем медленнее диск, тем больше группы. С wait=True вызывающий поток ждет,
+    пока его запись окажется на диске. Если файл не открывается или поток
+    записи падает, журнал отключается с предупреждением, а ждущие потоки
+    отпускаются.
+    """
+
+    def __init__(self, path: str = BET_JOURNAL_FILE, commit_ms: float = BET_JOURNAL_COMMIT_MS,
+                 wait: bool = BET_JOURNAL_WAIT):
+        self.path = path
+        self.commit_interval = max(0.0, commit_ms) / 1000
+        self.wait = wait
+        self.written = 0  # Записей на диске
+        self.commits = 0  # Выполнено fsync
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _start(self):
+        """Открывает файл в вызывающем потоке и запускает запись; если файл не открылся - отключает журнал"""
+        with self._lock:
+            if self._thread is None and not self._closed:
+                try:
+                    directory = os.path.dirname(self.path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    f = open(self.path, 'a', encoding='utf-8')
+                    self._terminate_last_line(f)
+                except OSError as e:
+                    self._closed = True
+                    logger.warning(f"⚠ Журнал ставок отключен: не удалось открыть {self.path}: {e}")
+                    return
+                self._thread = threading.Thread(target=self._writer, args=(f,), name="bet-journal", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _terminate_last_line(self, f):
+        """Дописывает перевод строки, если файл оборвался на середине записи (падение процесса)"""
+        if f.tell() == 0:
+            return
+        with open(self.path, 'rb') as tail:
+            tail.seek(-1, os.SEEK_END)
+            if tail.read(1) != b'\n':
+                f.write('\n')
+                f.flush()
+
+    def record(self, wallet: str, market_id: int, outcome: str, amount: float, ok: bool,
+               error: str = None, wait: bool = None):
+        """
+        Добавляет ставку в журнал
+
+        Args:
+            wallet: Адрес кошелька
+            market_id: ID маркета
+            outcome: YES или NO
+            amount: Сумма ставки
+            ok: Принята ли ставка сервером
+            error: Текст ошибки, если ставка не прошла
+            wait: Ждать fsync группы с этой записью (по умолчанию BET_JOURNAL_WAIT)
+        """
+        if not self.enabled or self._closed:
+            return
+        data = {'ts': round(time.time(), 3), 'wallet': wallet, 'market': market_id,
+                'outcome': outcome, 'amount': amount, 'ok': ok}
+        if error:
+            data['error'] = error
+        self.append(json.dumps(data, ensure_ascii=False, separators=(',', ':')),
+                    self.wait if wait is None else wait)
+
+    def append(self, line: str, wait: bool = False):
+        """Дописывает готовую строку JSON (без перевода строки)"""
+        if self._thread is None:
+            self._start()
+        self._put(line, wait)
+
+    def _put(self, line: str, wait: bool):
+        """Кладет запись в очередь, если журнал работает, и при wait ждет ее fsync"""
+        done = threading.Event() if wait else None
+        with self._lock:
+            if self._closed or self._thread is None:
+                return
+            self._queue.put(_Entry(line, done))
+        if done is not None:
+            done.wait()
+
+    def _writer(self, f):
+        """Фоновый поток: группы записей -> одна запись в файл -> один fsync"""
+        try:
+            with f:
+                self._write_batches(f)
+        except Exception as e:
+            logger.error(f"Журнал ставок {self.path} остановлен: {e}")
+        finally:
+            # Новые записи больше не принимаются, а ждущие записей из очереди не должны зависнуть
+            with self._lock:
+                self._closed = True
+                while True:
+                    try:
+                        entry = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if entry is not None and entry.done is not None:
+                        entry.done.set()
+
+    def _write_batches(self, f):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            batch: List[_Entry] = [entry]
+            deadline = time.monotonic() + self.commit_interval
+            stop = False
+            while len(batch) < MAX_BATCH:
+                timeout = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+            lines = [item.line for item in batch if item.line]  # Пустая строка - метка flush()
+            try:
+                if lines:
+                    f.write('\n'.join(lines) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self.written += len(lines)
+                    self.commits += 1
+            except OSError as e:
+                logger.warning(f"⚠ Не удалось записать журнал ставок {self.path}: {e}")
+            finally:
+                for item in batch:
+                    if item.done is not None:
+                        item.done.set()
+            if stop:
+                return
+
+    def flush(self):
+        """Ждет, пока все записи, добавленные до вызова, окажутся на диске"""
+        self._put('', wait=True)
+
+    def close(self):
+        """Дописывает очередь и останавливает фоновый поток"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._closed = True
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+
+class JournalTotals:
+    """Итоги по журналу: по кошелькам и по маркетам"""
+
+    def __init__(self):
+        # Кошелек -> [ставок, принятых, отклоненных, сумма принятых]
+        self.wallets: Dict[str, List] = {}
+        # Маркет -> [ставок, сумма YES, сумма NO]
+        self.markets: Dict[int, List] = {}
+        self.entries = 0
+        self.bad_lines = 0
+
+    def add(self, records: Iterable[Dict]):
+        wallets = self.wallets
+        markets = self.markets
+        for record in records:
+            try:
+                wallet = record['wallet']
+                market = record['market']
+                amount = record['amount']
+                ok = record['ok']
+            except (KeyError, TypeError):
+                self.bad_lines += 1
+                continue
+            self.entries += 1
+            totals = wallets.get(wallet)
+            if totals is None:
+                totals = wallets[wallet] = [0, 0, 0, 0.0]
+            totals[0] += 1
+            if not ok:
+                totals[2] += 1
+                continue
+            totals[1] += 1
+            totals[3] += amount
+            market_totals = markets.get(market)
+            if market_totals is None:
+                market_totals = markets[market] = [0, 0.0, 0.0]
+            market_totals[0] += 1
+            if record.get('outcome') == 'YES':
+                market_totals[1] += amount
+            else:
+                market_totals[2] += amount
+
+    def to_dict(self) -> Dict:
+        return {
+            'entries': self.entries,
+            'bad_lines': self.bad_lines,
+            'wallets': {
+                wallet: {'bets': bets, 'successful': ok, 'failed': failed, 'amount': amount}
+                for wallet, (bets, ok, failed, amount) in self.wallets.items()
+            },
+            'markets': {
+                market: {'bets': bets, 'yes_amount': yes_amount, 'no_amount': no_amount}
+                for market, (bets, yes_amount, no_amount) in self.markets.items()
+            },
+        }
+
+
+def _parse_chunk(lines: List[str], totals: JournalTotals):
+    """Разбирает пачку строк одним вызовом json.loads, при ошибке - построчно"""
+    try:
+        totals.add(json.loads('[' + ','.join(lines) + ']'))
+        return
+    except ValueError:
+        pass
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            totals.bad_lines += 1  # Например, строка, оборванная при падении процесса
+    totals.add(records)
+
+
+def replay(paths: Iterable[str]) -> JournalTotals:
+    """
+    Пересчитывает итоги по кошелькам и маркетам по одному или нескольким файлам журнала
+
+    Args:
+        paths: Файлы журнала (в порядке записи)
+    """
+    totals = JournalTotals()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            chunk: List[str] = []
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                chunk.append(line)
+                if len(chunk) >= REPLAY_CHUNK_LINES:
+                    _parse_chunk(chunk, totals)
+                    chunk = []
+            if chunk:
+                _parse_chunk(chunk, totals)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пересчет итогов по журналу ставок")
+    parser.add_argument('paths', nargs='*', default=[BET_JOURNAL_FILE], help="Файлы журнала")
+    parser.add_argument('--json', action='store_true', help="Вывести итоги в JSON")
+    parser.add_argument('--top', type=int, default=20, help="Сколько кошельков и маркетов показать")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    totals = replay(args.paths)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        json.dump(totals.to_dict(), sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+
+    print(f"Записей: {totals.entries} (битых строк: {totals.bad_lines}), кошельков: {len(totals.wallets)}, "
+          f"маркетов: {len(totals.markets)}, за {elapsed:.2f} сек")
+    print("\nКошельки (ставок / принятых / отклоненных / сумма):")
+    for wallet, (bets, ok, failed, amount) in sorted(totals.wallets.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {wallet}  {bets:>8} {ok:>8} {failed:>8} {amount:>14.2f}")
+    print("\nМаркеты (ставок / сумма YES / сумма NO):")
+    for market, (bets, yes_amount, no_amount) in sorted(totals.markets.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {market:>6}  {bets:>8} {yes_amount:>14.2f} {no_amount:>14.2f}")
+
+
+# Общий журнал ставок для всех WalletTrader в процессе
+bet_journal = BetJournal()
+
+
+if __name__ == "__main__":
+    main()
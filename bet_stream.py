@@ -0,0 +1,98 @@
+"""
+Потоковый разбор JSON-массива ставок без загрузки всего ответа в память
+"""
+import codecs
+import json
+import re
+from typing import Dict, Iterable, Iterator
+
+# Поля ставки, которые нужны для анализа маркета (см. market_columns) и идентификации ставки
+BET_FIELDS = ('amount', 'outcome', 'id', '_id', 'betId', 'timestamp', 'createdAt', 'created_at', 'userAddress', 'user')
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_SEPARATOR = re.compile(r'[ \t\n\r,]*')
+_DELIMITERS = frozenset(' \t\n\r,]')
+_decoder = json.JSONDecoder()
+
+
+def slim_bet(bet) -> Dict:
+    """Оставляет в ставке только поля, нужные для анализа (сумма, исход, ID/время и адрес для дедупликации)"""
+    if not isinstance(bet, dict):
+        return {}
+    return {field: bet[field] for field in BET_FIELDS if field in bet}
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator:
+    """
+    Разбирает JSON-массив по мере поступления данных и отдает элементы по одному
+
+    В памяти одновременно находится только текущий кусок ответа и один элемент.
+    Если ответ не является массивом, он разбирается целиком: для валидного JSON
+    ничего не отдается, для невалидного выбрасывается json.JSONDecodeError.
+
+    Args:
+        chunks: Куски тела ответа (например, response.iter_content())
+
+    Yields:
+        Элементы массива
+    """
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer = ''
+    pos = 0
+    eof = False
+    started = False
+
+    def read_more() -> bool:
+        nonlocal buffer, pos, eof
+        for chunk in chunks:
+            if not chunk:
+                continue
+            # Отбрасываем уже разобранную часть буфера
+            buffer = buffer[pos:] + text_decoder.decode(chunk)
+            pos = 0
+            return True
+        buffer = buffer[pos:] + text_decoder.decode(b'', final=True)
+        pos = 0
+        eof = True
+        return False
+
+    while True:
+        # Пропускаем пробелы (и запятые между элементами)
+        pos = (_SEPARATOR if started else _WHITESPACE).match(buffer, pos).end()
+        if pos >= len(buffer):
+            if eof:
+                raise json.JSONDecodeError("Неожиданный конец JSON", buffer, pos)
+            read_more()
+            continue
+
+        if not started:
+            if buffer[pos] != '[':
+                # Не массив: дочитываем ответ и проверяем, что это валидный JSON
+                while not eof:
+                    read_more()
+                json.loads(buffer[pos:])
+                return
+            started = True
+            pos += 1
+            continue
+
+        if buffer[pos] == ']':
+            return
+
+        try:
+            item, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            read_more()
+            continue
+
+        # За элементом должен идти разделитель, иначе он мог быть обрезан на границе
+        # кусков: из "1.5e3" raw_decode успешно разбирает и "1", и "1.5"
+        if not eof and (end >= len(buffer) or buffer[end] not in _DELIMITERS):
+            read_more()
+            continue
+
+        pos = end
+        yield item
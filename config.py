@@ -7,7 +7,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # API настройки
-API_BASE_URL = "https://inkpredict.vercel.app/api"
+API_BASE_URL = os.getenv("API_BASE_URL", "https://inkpredict.vercel.app/api")  # Базовый URL API
+SITE_URL = os.getenv("SITE_URL", "https://prediction.boinknfts.club")  # URL сайта (реферальные ссылки)
 MARKET_ID = 109
 
 # Настройки кошелька
@@ -28,5 +29,83 @@ RANDOM_MARKETS = os.getenv("RANDOM_MARKETS", "true").lower() == "true"  # Выб
 # Реферальный код зашит в код
 REFERRAL_CODE = "BA08NOBF"  # Реферальный код для регистрации новых аккаунтов
 
+# Настройки параллельности
+MARKET_DISCOVERY_CONCURRENCY = int(os.getenv("MARKET_DISCOVERY_CONCURRENCY", "16"))  # Параллельных проверок при поиске маркетов
+MAX_AVAILABLE_MARKETS = 20  # Сколько доступных маркетов искать
+
+# Настройки кеша ставок маркетов (общий для всех кошельков)
+MARKET_CACHE_TTL_SECONDS = float(os.getenv("MARKET_CACHE_TTL_SECONDS", "30"))  # Время жизни снимка ставок маркета
+MARKET_CACHE_MAX_SIZE = int(os.getenv("MARKET_CACHE_MAX_SIZE", "64"))  # Максимум маркетов в кеше
+
+# Настройки пула HTTP-соединений (одна сессия на прокси)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))  # Максимум соединений в пуле на хост
+HTTP_KEEPALIVE = os.getenv("HTTP_KEEPALIVE", "true").lower() == "true"  # Держать соединения открытыми (keep-alive)
+
+# Потоковый разбор ставок маркетов
+MARKET_BETS_STREAMING = os.getenv("MARKET_BETS_STREAMING", "true").lower() == "true"  # Разбирать ставки маркета потоково
+STREAM_CHUNK_SIZE = 64 * 1024  # Размер куска ответа при потоковом чтении (байт)
+
+# Ограничение частоты запросов (token bucket на каждую пару хост/прокси и класс запроса)
+RATE_LIMIT_READ_PER_SEC = float(os.getenv("RATE_LIMIT_READ_PER_SEC", "20"))  # Запросов чтения в секунду на прокси
+RATE_LIMIT_WRITE_PER_SEC = float(os.getenv("RATE_LIMIT_WRITE_PER_SEC", "2"))  # Ставок/клеймов в секунду на прокси
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "10"))  # Размер всплеска (емкость ведра)
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "3"))  # Повторов запроса после 429/503
+RATE_LIMIT_BACKOFF_BASE = float(os.getenv("RATE_LIMIT_BACKOFF_BASE", "1.0"))  # Базовая задержка повтора (сек)
+RATE_LIMIT_BACKOFF_MAX = float(os.getenv("RATE_LIMIT_BACKOFF_MAX", "60"))  # Максимальная задержка повтора (сек)
+
+# Кеш адресов кошельков (ключ -> адрес), ключи в файл не записываются
+ADDRESS_CACHE_FILE = os.getenv("ADDRESS_CACHE_FILE", "address_cache.json")  # Файл кеша адресов
+ADDRESS_DERIVE_WORKERS = int(os.getenv("ADDRESS_DERIVE_WORKERS", "0"))  # Процессов для извлечения адресов (0 - по числу ядер)
+
+# Кеш статистики кошельков для условных запросов (ETag/Last-Modified)
+STATS_CACHE_MAX_SIZE = int(os.getenv("STATS_CACHE_MAX_SIZE", "10000"))  # Максимум кошельков в кеше
+
+# Метрики API клиента (сохраняются в JSON в конце каждого режима)
+METRICS_DIR = os.getenv("METRICS_DIR", "metrics")  # Папка для файлов метрик
+
+# Настройки сохраненного индекса маркетов
+MARKET_INDEX_FILE = os.getenv("MARKET_INDEX_FILE", "market_index.json")  # Файл индекса доступных маркетов
+MARKET_INDEX_TTL_SECONDS = float(os.getenv("MARKET_INDEX_TTL_SECONDS", "3600"))  # Через сколько запись считается устаревшей
+
+# Параллельная обработка кошельков в режимах дейлика и статистики
+FLEET_WORKERS = int(os.getenv("FLEET_WORKERS", "16"))  # Кошельков, обрабатываемых одновременно
+FLEET_PER_PROXY_CONCURRENCY = int(os.getenv("FLEET_PER_PROXY_CONCURRENCY", "4"))  # Одновременных кошельков на один прокси
+
+# Выгрузка статистики кошельков (режим 4)
+STATS_EXPORT_FORMAT = os.getenv("STATS_EXPORT_FORMAT", "csv")  # Формат выгрузки: csv, jsonl или none
+STATS_EXPORT_DIR = os.getenv("STATS_EXPORT_DIR", "stats")  # Папка для файлов выгрузки
+
+# Расписание дейлика (хранится локально, проверка кулдауна без запросов к API)
+DAILY_SCHEDULE_FILE = os.getenv("DAILY_SCHEDULE_FILE", "daily_schedule.json")  # Файл расписания дейлика
+DAILY_COOLDOWN_SECONDS = float(os.getenv("DAILY_COOLDOWN_SECONDS", "86400"))  # Кулдаун после успешного клейма
+DAILY_UNKNOWN_COOLDOWN_SECONDS = float(os.getenv("DAILY_UNKNOWN_COOLDOWN_SECONDS", "3600"))  # Отсрочка, если сервер не сообщил время следующего клейма
+DAILY_RETRY_SECONDS = 300  # Через сколько повторить клейм после ошибки в режиме ожидания
+DAILY_WATCH = os.getenv("DAILY_WATCH", "false").lower() == "true"  # Не выходить из режима дейлика, а ждать следующих клеймов
+
+# Планировщик AutoTrader (задачи кошельков выполняются по сроку в пуле потоков)
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "16"))  # Потоков для выполнения задач кошельков
+STATS_REFRESH_INTERVAL_SECONDS = float(os.getenv("STATS_REFRESH_INTERVAL_SECONDS", "300"))  # Как часто обновлять статистику кошелька
+
+# Состояние кошельков автотрейдера между перезапусками (SQLite)
+STATE_DB_FILE = os.getenv("STATE_DB_FILE", "trader_state.db")  # Файл базы состояния
+STATE_FLUSH_SECONDS = float(os.getenv("STATE_FLUSH_SECONDS", "2"))  # Как часто записывать накопленные изменения
+
+# Журнал ставок (JSON Lines, только дописывается; итоги: python -m bet_journal)
+BET_JOURNAL_FILE = os.getenv("BET_JOURNAL_FILE", "bets.jsonl")  # Файл журнала (пусто - не вести)
+BET_JOURNAL_COMMIT_MS = float(os.getenv("BET_JOURNAL_COMMIT_MS", "0"))  # Дополнительно ждать записи в группу перед fsync (мс)
+BET_JOURNAL_WAIT = os.getenv("BET_JOURNAL_WAIT", "false").lower() == "true"  # Ждать fsync записи перед следующей ставкой
+
+# Живая панель вместо построчного вывода событий (события пишутся только в лог)
+DASHBOARD = os.getenv("DASHBOARD", "false").lower() == "true"  # Показывать панель в автотрейдере и режиме ставок
+DASHBOARD_REFRESH_SECONDS = float(os.getenv("DASHBOARD_REFRESH_SECONDS", "1"))  # Как часто перерисовывать панель
+DASHBOARD_MAX_WALLETS = int(os.getenv("DASHBOARD_MAX_WALLETS", "20"))  # Сколько кошельков показывать в таблице XP
+
 # Настройки логирования
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")  # Уровень записей в файле лога
+LOG_FILE = os.getenv("LOG_FILE", "trader.log")  # Файл лога
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # Формат файла лога: text или json (JSON Lines)
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))  # Размер файла, после которого он ротируется
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "")  # Ротация по времени (midnight, h, d ...) вместо ротации по размеру
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))  # Сколько старых файлов лога хранить
+LOG_COMPRESS = os.getenv("LOG_COMPRESS", "true").lower() == "true"  # Сжимать старые файлы лога в gzip
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # Максимум записей в очереди лога (лишние отбрасываются)
@@ -1,10 +1,50 @@
 """
 Утилиты для работы с криптографией и подписью транзакций
 """
-from eth_account import Account
-from eth_account.messages import encode_defunct
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Optional
 import hashlib
+import threading
+
+# eth_account импортируется при первой подписи: он долго загружается, а при запуске
+# адреса обычно уже есть в кеше (см. address_cache)
+if TYPE_CHECKING:
+    from eth_account.signers.local import LocalAccount
+
+# Кеш объектов аккаунтов: ключ разбирается и адрес вычисляется один раз на кошелек
+_signer_cache: Dict[str, "LocalAccount"] = {}
+_signer_lock = threading.Lock()
+
+
+def get_signer(private_key: str) -> "LocalAccount":
+    """
+    Возвращает объект аккаунта для приватного ключа (из кеша, если уже создавался)
+    
+    Args:
+        private_key: Приватный ключ (с префиксом 0x или без)
+    
+    Returns:
+        LocalAccount для подписи сообщений
+    """
+    # Убираем префикс 0x если есть
+    if private_key.startswith('0x'):
+        private_key = private_key[2:]
+    key = private_key.lower()
+    
+    account = _signer_cache.get(key)
+    if account is None:
+        from eth_account import Account
+        
+        # Создаем аккаунт из приватного ключа
+        account = Account.from_key(key)
+        with _signer_lock:
+            account = _signer_cache.setdefault(key, account)
+    return account
+
+
+def clear_signer_cache():
+    """Очищает кеш аккаунтов (например, после перезагрузки ключей)"""
+    with _signer_lock:
+        _signer_cache.clear()
 
 
 def sign_message(message: str, private_key: str) -> str:
@@ -18,12 +58,9 @@ def sign_message(message: str, private_key: str) -> str:
     Returns:
         Подпись в формате hex
     """
-    # Убираем префикс 0x если есть
-    if private_key.startswith('0x'):
-        private_key = private_key[2:]
+    from eth_account.messages import encode_defunct
     
-    # Создаем аккаунт из приватного ключа
-    account = Account.from_key(private_key)
+    account = get_signer(private_key)
     
     # Кодируем сообщение по стандарту EIP-191
     message_encoded = encode_defunct(text=message)
@@ -44,14 +81,7 @@ def verify_address_from_key(private_key: str) -> str:
     Returns:
         Адрес кошелька
     """
-    # Убираем префикс 0x если есть
-    if private_key.startswith('0x'):
-        private_key = private_key[2:]
-    
-    # Создаем аккаунт из приватного ключа
-    account = Account.from_key(private_key)
-    
-    return account.address
+    return get_signer(private_key).address
 
 
 def verify_key_address_match(private_key: str, address: str) -> bool:
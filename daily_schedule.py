@@ -0,0 +1,185 @@
+"""
+Сохраняемое на диск расписание дейлика: когда кошелек клеймил и когда сможет снова
+"""
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+from rate_limiter import parse_retry_after
+from config import DAILY_SCHEDULE_FILE, DAILY_COOLDOWN_SECONDS, DAILY_UNKNOWN_COOLDOWN_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Поля ответа сервера, в которых может прийти время следующего клейма или остаток кулдауна
+NEXT_CLAIM_FIELDS = ('nextClaimAt', 'nextClaimTime', 'next_claim_at', 'nextClaim', 'availableAt')
+COOLDOWN_FIELDS = ('cooldownSeconds', 'cooldown', 'remainingSeconds', 'timeLeft', 'retryAfter')
+
+# Метки времени больше этой - в миллисекундах (JS Date.now())
+_MS_THRESHOLD = 10 ** 11
+
+# Как часто сохранять расписание на диск при частых обновлениях (сек)
+_SAVE_INTERVAL = 5.0
+
+
+def _to_timestamp(value) -> Optional[float]:
+    """Переводит время из ответа сервера (секунды, миллисекунды или ISO 8601) в unix time"""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return value / 1000 if value > _MS_THRESHOLD else float(value)
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            return _to_timestamp(float(value))
+        except ValueError:
+            pass
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def parse_next_claim(data, headers=None, now: float = None) -> Optional[float]:
+    """
+    Достает из ответа сервера время, когда дейлик станет доступен
+
+    Args:
+        data: Разобранное тело ответа (словарь)
+        headers: Заголовки ответа (учитывается Retry-After)
+        now: Текущее время
+
+    Returns:
+        Unix time следующего клейма или None, если сервер его не сообщил
+    """
+    now = now or time.time()
+    if isinstance(data, dict):
+        for field in NEXT_CLAIM_FIELDS:
+            timestamp = _to_timestamp(data.get(field))
+            if timestamp:
+                return timestamp
+        for field in COOLDOWN_FIELDS:
+            value = data.get(field)
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+                return now + value
+    if headers is not None:
+        retry_after = parse_retry_after(headers.get('Retry-After'))
+        if retry_after:
+            return now + retry_after
+    return None
+
+
+class DailySchedule:
+    """
+    Расписание дейлика по кошелькам
+
+    Для каждого кошелька хранится время последнего успешного клейма и время,
+    когда дейлик станет доступен снова. Проверка "пора ли клеймить" не требует
+    запросов к API.
+    """
+
+    def __init__(self, path: str = DAILY_SCHEDULE_FILE):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.loaded = False
+        self.dirty = False
+        self._changes = 0  # Счетчик изменений: сохранение снимает dirty, только если новых не было
+        self._saved_at = 0.0
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+
+    def load(self) -> int:
+        """
+        Загружает расписание из файла (один раз)
+
+        Returns:
+            Количество кошельков в расписании
+        """
+        with self._lock:
+            if self.loaded:
+                return len(self.entries)
+            self.loaded = True
+            if not os.path.exists(self.path):
+                return 0
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                wallets = data.get('wallets', {}) if isinstance(data, dict) else {}
+                self.entries = {address.lower(): entry for address, entry in wallets.items()}
+            except Exception as e:
+                print(f"⚠ Не удалось прочитать расписание дейлика {self.path}: {e}")
+            return len(self.entries)
+
+    def save(self):
+        """Сохраняет расписание в файл, если оно менялось (через временный файл)"""
+        with self._save_lock:
+            with self._lock:
+                if not self.dirty:
+                    return
+                data = {'wallets': dict(sorted(self.entries.items()))}
+                changes = self._changes
+                self._saved_at = time.time()
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+                # Сбрасываем только после записи: при ошибке изменения сохранятся в следующий раз
+                with self._lock:
+                    if self._changes == changes:
+                        self.dirty = False
+            except Exception as e:
+                logger.warning(f"⚠ Не удалось сохранить расписание дейлика {self.path}: {e}")
+
+    def _update(self, address: str, **fields):
+        with self._lock:
+            self.load()
+            self.entries.setdefault(address.lower(), {}).update(fields)
+            self.dirty = True
+            self._changes += 1
+            save_now = time.time() - self._saved_at >= _SAVE_INTERVAL
+        if save_now:
+            self.save()
+
+    def record_claim(self, address: str, claimed_at: float = None):
+        """Записывает успешный клейм: следующий через DAILY_COOLDOWN_SECONDS"""
+        claimed_at = claimed_at or time.time()
+        self._update(address, last_claim_at=claimed_at, next_claim_at=claimed_at + DAILY_COOLDOWN_SECONDS)
+
+    def record_cooldown(self, address: str, next_claim_at: Optional[float] = None):
+        """
+        Записывает ответ сервера "уже клеймлено"
+
+        Args:
+            address: Адрес кошелька
+            next_claim_at: Время следующего клейма из ответа сервера; если сервер его не
+                сообщил, кошелек откладывается на DAILY_UNKNOWN_COOLDOWN_SECONDS
+        """
+        if next_claim_at is None:
+            next_claim_at = time.time() + DAILY_UNKNOWN_COOLDOWN_SECONDS
+        self._update(address, next_claim_at=next_claim_at)
+
+    def next_claim_at(self, address: str) -> Optional[float]:
+        """Время, когда дейлик кошелька станет доступен (None - неизвестно, можно клеймить)"""
+        with self._lock:
+            self.load()
+            entry = self.entries.get(address.lower())
+            return entry.get('next_claim_at') if entry else None
+
+    def is_due(self, address: str, now: float = None) -> bool:
+        """Можно ли клеймить дейлик кошелька сейчас"""
+        next_claim = self.next_claim_at(address)
+        return next_claim is None or next_claim <= (now or time.time())
+
+    def next_due_at(self, addresses: Iterable[str]) -> Optional[float]:
+        """Ближайшее время, когда дейлик станет доступен хотя бы у одного из кошельков"""
+        times = [self.next_claim_at(address) for address in addresses]
+        times = [next_claim for next_claim in times if next_claim is not None]
+        return min(times) if times else None
+
+
+# Общее расписание дейлика (API клиент и режим дейлика)
+daily_schedule = DailySchedule()
@@ -0,0 +1,149 @@
+"""
+Живая панель: перерисовывается с фиксированной частотой по агрегированным счетчикам
+"""
+import sys
+import time
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+from colorama import Fore, Style
+from metrics import api_metrics
+from logging_setup import set_console_logging
+from config import DASHBOARD_REFRESH_SECONDS, DASHBOARD_MAX_WALLETS
+
+# Курсор в начало экрана и очистка (colorama переводит их для консоли Windows)
+_CLEAR_SCREEN = "\x1b[H\x1b[2J"
+
+WIDTH = 58
+
+
+def wallet_xp(user_stats) -> Optional[tuple]:
+    """XP и уровень из ответа /user/{address}/stats (None, если статистики нет)"""
+    if not isinstance(user_stats, dict):
+        return None
+    stats = user_stats.get('stats', user_stats)
+    if not isinstance(stats, dict):
+        return None
+    xp = stats.get('xp', stats.get('XP', stats.get('experience', 'N/A')))
+    level = stats.get('level', stats.get('Level', 'N/A'))
+    return xp, level
+
+
+class Dashboard:
+    """
+    Панель состояния торговли в консоли
+
+    Отдельный поток раз в DASHBOARD_REFRESH_SECONDS собирает счетчики трейдеров,
+    метрики API и планировщика и перерисовывает экран одной записью. Пока панель
+    показана, события print_status идут только в лог.
+    """
+
+    def __init__(self, traders: List, scheduler=None, refresh: float = DASHBOARD_REFRESH_SECONDS,
+                 max_wallets: int = DASHBOARD_MAX_WALLETS):
+        self.traders = traders
+        self.scheduler = scheduler
+        self.refresh = max(0.1, refresh)
+        self.max_wallets = max_wallets
+        self.started_at = time.time()
+        self._last_bets = 0
+        self._last_time = self.started_at
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Отключает вывод событий в консоль и запускает перерисовку"""
+        set_console_logging(False)
+        self.started_at = self._last_time = time.time()
+        self._last_bets = self._totals()['total_bets']
+        self._thread = threading.Thread(target=self._loop, name="dashboard", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Останавливает перерисовку (последний кадр остается на экране) и возвращает вывод событий"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.draw()
+        set_console_logging(True)
+
+    def _loop(self):
+        while not self._stop.wait(self.refresh):
+            try:
+                self.draw()
+            except Exception:
+                pass
+
+    def _totals(self) -> Dict[str, int]:
+        totals = {'total_bets': 0, 'successful_bets': 0, 'failed_bets': 0, 'daily_claims': 0}
+        for trader in self.traders:
+            for name in totals:
+                totals[name] += trader.stats[name]
+        return totals
+
+    def _line(self, text: str, color: str = Fore.WHITE) -> str:
+        return f"{Fore.MAGENTA}║{color}{text:<{WIDTH}}{Fore.MAGENTA}║{Style.RESET_ALL}"
+
+    def render(self) -> str:
+        """Собирает кадр панели"""
+        now = time.time()
+        totals = self._totals()
+        elapsed = max(now - self.started_at, 1e-9)
+        interval = max(now - self._last_time, 1e-9)
+        current_rate = (totals['total_bets'] - self._last_bets) / interval
+        self._last_bets, self._last_time = totals['total_bets'], now
+        error_rate = totals['failed_bets'] / totals['total_bets'] if totals['total_bets'] else 0.0
+
+        snapshot = api_metrics.snapshot()
+        api_errors = sum(
+            count
+            for data in snapshot['endpoints'].values()
+            for status, count in data['statuses'].items()
+            if not status.isdigit() or int(status) >= 400
+        )
+        api_error_rate = api_errors / snapshot['total_requests'] if snapshot['total_requests'] else 0.0
+
+        border = '═' * WIDTH
+        lines = [
+            f"{Fore.MAGENTA}╔{border}╗{Style.RESET_ALL}",
+            self._line(f"{'📊 ТОРГОВЛЯ ' + datetime.now().strftime('%H:%M:%S'):^{WIDTH}}", Fore.MAGENTA),
+            f"{Fore.MAGENTA}╠{border}╣{Style.RESET_ALL}",
+            self._line(f" Кошельков: {len(self.traders):<10} Работает: {int(elapsed)} сек"),
+            self._line(f" Ставок: {totals['total_bets']:<8} успешных: {totals['successful_bets']:<8} "
+                       f"неудачных: {totals['failed_bets']}", Fore.CYAN),
+            self._line(f" Ставок/сек: {current_rate:<8.2f} в среднем: {totals['total_bets'] / elapsed:.2f}", Fore.GREEN),
+            self._line(f" Ошибок ставок: {error_rate:<8.1%} ошибок API: {api_error_rate:.1%}",
+                       Fore.RED if error_rate or api_error_rate else Fore.WHITE),
+            self._line(f" Запросов API: {snapshot['total_requests']:<8} в полете: {api_metrics.in_flight}"),
+        ]
+        if self.scheduler is not None:
+            lines.append(self._line(
+                f" Задач в работе: {self.scheduler.in_flight:<6} в очереди: {self.scheduler.pending():<6} "
+                f"выполнено: {self.scheduler.completed}"
+            ))
+        if totals['daily_claims']:
+            lines.append(self._line(f" Клеймов дейлика: {totals['daily_claims']}"))
+
+        lines.append(f"{Fore.MAGENTA}╠{border}╣{Style.RESET_ALL}")
+        lines.append(self._line(f"{'💼 КОШЕЛЬКИ':^{WIDTH}}", Fore.MAGENTA))
+        for i, trader in enumerate(self.traders[:self.max_wallets], 1):
+            xp = wallet_xp(trader.user_stats)
+            progress = f"XP: {xp[0]}, Level: {xp[1]}" if xp else "статистика не загружена"
+            lines.append(self._line(f" {i:>3}. {trader.wallet_address[:10]}... {progress:<24.24} ставок: {trader.stats['total_bets']}"))
+        if len(self.traders) > self.max_wallets:
+            lines.append(self._line(f" ... и еще {len(self.traders) - self.max_wallets} кошельков"))
+        lines.append(f"{Fore.MAGENTA}╚{border}╝{Style.RESET_ALL}")
+        return "\n".join(lines)
+
+    def draw(self):
+        """Перерисовывает экран одной записью в stdout"""
+        frame = _CLEAR_SCREEN + self.render() + "\n"
+        sys.stdout.write(frame)
+        sys.stdout.flush()
+
+    def __enter__(self) -> 'Dashboard':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,135 @@
+"""
+Таблица решений по всем маркетам: рекомендуемый исход и перекос, считаются одним векторным проходом
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, NamedTuple, Optional
+import numpy as np
+from market_cache import market_bets_cache
+from market_columns import MarketColumns, OUTCOME_YES, OUTCOME_NO, OUTCOME_OTHER, market_columns_store
+from config import MARKET_DISCOVERY_CONCURRENCY, MARKET_CACHE_TTL_SECONDS, MARKET_BETS_STREAMING
+
+_OUTCOME_NAMES = {OUTCOME_YES: "YES", OUTCOME_NO: "NO"}
+
+
+def fetch_market_columns(api, market_id: int) -> MarketColumns:
+    """
+    Загружает ставки маркета и дописывает новые в его колонки (потоково, если включено MARKET_BETS_STREAMING)
+
+    Колонки маркета переживают кеш снимков: после истечения TTL в них попадают
+    только ставки, появившиеся с прошлой загрузки.
+    """
+    bets = api.iter_market_bets(market_id) if MARKET_BETS_STREAMING else api.get_market_bets(market_id)
+    return market_columns_store.update(market_id, bets)
+
+
+class Decision(NamedTuple):
+    """Решение по маркету: исход (None - объемы равны, выбирается случайно) и перекос YES/NO"""
+    outcome: Optional[str]
+    imbalance: float
+    yes_amount: float
+    no_amount: float
+
+
+class DecisionTable:
+    """
+    Решения по маркетам на момент построения
+
+    Стратегия - против большинства: если на YES поставлено больше, рекомендуется NO, и наоборот.
+    """
+
+    def __init__(self, decisions: Dict[int, Decision], built_at: float = None):
+        self.decisions = decisions
+        self.built_at = built_at or time.time()
+
+    @classmethod
+    def build(cls, snapshots: Dict[int, MarketColumns]) -> 'DecisionTable':
+        """
+        Строит таблицу по снимкам всех маркетов за один проход
+
+        Ставки всех маркетов склеиваются в общие колонки, а суммы YES/NO по
+        маркетам считаются через np.bincount по номеру маркета.
+
+        Args:
+            snapshots: Снимки ставок по ID маркета
+        """
+        market_ids = list(snapshots)
+        if not market_ids:
+            return cls({})
+        columns = [snapshots[market_id].snapshot() for market_id in market_ids]
+        sizes = np.fromiter((len(amounts) for amounts, _, _ in columns), dtype=np.int64, count=len(columns))
+        market_index = np.repeat(np.arange(len(columns)), sizes)
+        amounts = np.concatenate([column[0] for column in columns])
+        outcomes = np.concatenate([column[1] for column in columns])
+
+        yes = np.bincount(market_index, weights=np.where(outcomes == OUTCOME_YES, amounts, 0.0), minlength=len(columns))
+        no = np.bincount(market_index, weights=np.where(outcomes == OUTCOME_NO, amounts, 0.0), minlength=len(columns))
+        total = yes + no
+        imbalance = np.divide(yes - no, total, out=np.zeros_like(total), where=total > 0)
+        recommended = np.where(yes > no, OUTCOME_NO, np.where(no > yes, OUTCOME_YES, OUTCOME_OTHER))
+
+        decisions = {
+            market_id: Decision(_OUTCOME_NAMES.get(int(code)), float(score), float(yes_amount), float(no_amount))
+            for market_id, code, score, yes_amount, no_amount
+            in zip(market_ids, recommended, imbalance, yes, no)
+        }
+        return cls(decisions)
+
+    def lookup(self, market_id: int) -> Optional[Decision]:
+        """Решение по маркету или None, если маркета нет в таблице"""
+        return self.decisions.get(market_id)
+
+    def __len__(self) -> int:
+        return len(self.decisions)
+
+
+class MarketDecisions:
+    """Текущая таблица решений, общая для всех трейдеров (заменяется целиком при обновлении)"""
+
+    def __init__(self, max_age: float = MARKET_CACHE_TTL_SECONDS * 2):
+        self.max_age = max_age
+        self.table: Optional[DecisionTable] = None
+        self._lock = threading.Lock()
+
+    def refresh(self, api, market_ids: Iterable[int], concurrency: int = MARKET_DISCOVERY_CONCURRENCY) -> DecisionTable:
+        """
+        Загружает снимки маркетов (через общий кеш) и строит новую таблицу
+
+        Маркеты, которые не удалось загрузить, в таблицу не попадают - для них
+        трейдер анализирует маркет сам.
+
+        Args:
+            api: API клиент для загрузки ставок
+            market_ids: ID маркетов
+            concurrency: Сколько маркетов загружать параллельно
+        """
+        market_ids = list(dict.fromkeys(market_ids))
+
+        def load(market_id: int) -> Optional[MarketColumns]:
+            try:
+                return market_bets_cache.get(market_id, lambda market: fetch_market_columns(api, market))
+            except Exception:
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(market_ids) or 1))) as executor:
+            snapshots = {
+                market_id: columns
+                for market_id, columns in zip(market_ids, executor.map(load, market_ids))
+                if columns is not None
+            }
+        table = DecisionTable.build(snapshots)
+        with self._lock:
+            self.table = table
+        return table
+
+    def lookup(self, market_id: int) -> Optional[Decision]:
+        """Решение по маркету из текущей таблицы (None, если таблицы нет, она устарела или маркета в ней нет)"""
+        table = self.table
+        if table is None or time.time() - table.built_at > self.max_age:
+            return None
+        return table.lookup(market_id)
+
+
+# Общая таблица решений для всех WalletTrader в процессе
+market_decisions = MarketDecisions()
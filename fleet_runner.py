@@ -0,0 +1,68 @@
+"""
+Параллельное выполнение задачи для каждого кошелька с ограничением на прокси
+"""
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from wallet_manager import WalletProxy
+from config import FLEET_WORKERS, FLEET_PER_PROXY_CONCURRENCY
+
+
+def run_fleet(wallet_proxies: List[WalletProxy], task: Callable[[WalletProxy], Any],
+              workers: int = FLEET_WORKERS,
+              per_proxy: int = FLEET_PER_PROXY_CONCURRENCY) -> Iterator[Tuple[WalletProxy, Any, Optional[Exception]]]:
+    """
+    Выполняет task для каждого кошелька в пуле потоков и отдает результаты по мере готовности
+
+    Одновременно работает не больше workers задач и не больше per_proxy задач
+    на один прокси (кошельки без прокси считаются одним прокси - это один IP).
+    Кошельки ждут своей очереди в списке прокси, а не в потоках пула, поэтому
+    занятый прокси не блокирует кошельки с другими прокси.
+
+    Args:
+        wallet_proxies: Кошельки
+        task: Функция, выполняемая для кошелька
+        workers: Максимум одновременных задач
+        per_proxy: Максимум одновременных задач на один прокси
+
+    Yields:
+        Кортежи (кошелек, результат, None) или (кошелек, None, исключение)
+    """
+    workers = max(1, workers)
+    per_proxy = max(1, per_proxy)
+
+    queues: Dict[Optional[str], deque] = {}
+    for wallet_proxy in wallet_proxies:
+        queues.setdefault(wallet_proxy.proxy, deque()).append(wallet_proxy)
+
+    # Прокси, у которых есть и ожидающие кошельки, и свободные места
+    ready = deque(queues)
+    in_ready = set(ready)
+    active = Counter()
+    futures = {}
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fleet')
+    try:
+        while ready or futures:
+            while ready and len(futures) < workers:
+                proxy = ready.popleft()
+                in_ready.discard(proxy)
+                wallet_proxy = queues[proxy].popleft()
+                futures[executor.submit(task, wallet_proxy)] = wallet_proxy
+                active[proxy] += 1
+                if queues[proxy] and active[proxy] < per_proxy:
+                    ready.append(proxy)
+                    in_ready.add(proxy)
+
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                wallet_proxy = futures.pop(future)
+                proxy = wallet_proxy.proxy
+                active[proxy] -= 1
+                if queues[proxy] and proxy not in in_ready:
+                    ready.append(proxy)
+                    in_ready.add(proxy)
+                error = future.exception()
+                yield wallet_proxy, (None if error else future.result()), error
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
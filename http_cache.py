@@ -0,0 +1,83 @@
+"""
+Кеш ответов для условных HTTP-запросов (ETag / Last-Modified)
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from config import STATS_CACHE_MAX_SIZE
+
+
+class ConditionalCache:
+    """
+    Хранит последний ответ и его валидаторы (ETag, Last-Modified) по ключу
+
+    Следующий запрос отправляется с If-None-Match / If-Modified-Since, и если
+    сервер отвечает 304, используется сохраненное тело без повторной загрузки.
+    """
+
+    def __init__(self, max_size: int = STATS_CACHE_MAX_SIZE):
+        self.max_size = max(1, max_size)
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0  # Ответы 304, обслуженные из кеша
+        self.misses = 0  # Полные ответы 200
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """Возвращает заголовки для условного запроса (пустой словарь, если ответа нет в кеше)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return {}
+            headers = {}
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+            return headers
+
+    def get(self, key: str) -> Optional[Any]:
+        """Возвращает сохраненное тело ответа после 304 (учитывается как попадание)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry['body']
+
+    def store(self, key: str, headers, body: Any):
+        """
+        Сохраняет тело ответа 200 вместе с его валидаторами
+
+        Args:
+            key: Ключ кеша (например, адрес кошелька)
+            headers: Заголовки ответа
+            body: Разобранное тело ответа
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        with self._lock:
+            self.misses += 1
+            if not etag and not last_modified:
+                # Без валидаторов условный запрос невозможен - не храним
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = {'etag': etag, 'last_modified': last_modified, 'body': body}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        """Возвращает счетчики кеша"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+    def reset_stats(self):
+        """Сбрасывает счетчики (сохраненные ответы остаются, например, в начале нового запуска режима)"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+# Общий кеш статистики кошельков (get_user_stats во всех режимах и трейдерах)
+user_stats_cache = ConditionalCache()
@@ -0,0 +1,180 @@
+"""
+Логирование через очередь: запись в консоль и файл выполняет фоновый поток
+
+Вызывающий поток только кладет запись в очередь. Файл лога ротируется по
+размеру или по времени, старые файлы сжимаются в gzip. Формат файла - текст
+или JSON Lines (по строке JSON на запись).
+"""
+import os
+import sys
+import gzip
+import json
+import queue
+import atexit
+import shutil
+import logging
+import logging.handlers
+from datetime import datetime
+from typing import Optional
+from config import (
+    LOG_LEVEL, LOG_FILE, LOG_FORMAT, LOG_MAX_BYTES, LOG_ROTATE_WHEN,
+    LOG_BACKUP_COUNT, LOG_COMPRESS, LOG_QUEUE_SIZE
+)
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Поля записи, которые print_status передает через extra и которые попадают в JSON
+_EXTRA_FIELDS = ('wallet', 'status')
+
+_queue: Optional[queue.Queue] = None
+_handler: Optional['DroppingQueueHandler'] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_console: Optional['ConsoleHandler'] = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Запись лога одной строкой JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in _EXTRA_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        if record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class ConsoleHandler(logging.Handler):
+    """
+    Вывод в консоль: цветная строка print_status (поле console) или обычный текст
+
+    sys.stdout берется в момент записи, поэтому перенаправление вывода работает и для фонового потока.
+    """
+
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            line = getattr(record, 'console', None) or self.format(record)
+            stream = sys.stdout
+            stream.write(line + '\n')
+            stream.flush()
+        except Exception:
+            self.handleError(record)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler, который при переполненной очереди отбрасывает запись, а не блокирует поток"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _gzip_namer(name: str) -> str:
+    return name + '.gz'
+
+
+def _gzip_rotator(source: str, dest: str):
+    """Сжимает ротированный файл лога (выполняется в фоновом потоке)"""
+    with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def _file_handler(path: str) -> logging.Handler:
+    """Файловый обработчик с ротацией: по времени, если задан LOG_ROTATE_WHEN, иначе по размеру"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if LOG_ROTATE_WHEN:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+    if LOG_COMPRESS:
+        handler.namer = _gzip_namer
+        handler.rotator = _gzip_rotator
+    if LOG_FORMAT.lower() == 'json':
+        handler.setFormatter(JsonLinesFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    handler.setLevel(LOG_LEVEL.upper())
+    return handler
+
+
+def setup_logging(path: str = LOG_FILE):
+    """
+    Настраивает логирование через очередь (один раз на процесс)
+
+    В файл пишутся записи уровня LOG_LEVEL и выше, в консоль - INFO и выше.
+    Фоновый поток останавливается при выходе из процесса, дописав очередь.
+    """
+    global _queue, _handler, _listener, _console
+    if _listener is not None:
+        return
+    file_level = logging.getLevelName(LOG_LEVEL.upper())
+    if not isinstance(file_level, int):
+        file_level = logging.INFO
+
+    _queue = queue.Queue(LOG_QUEUE_SIZE)
+    _handler = DroppingQueueHandler(_queue)
+    _console = ConsoleHandler(logging.INFO)
+    _listener = logging.handlers.QueueListener(
+        _queue, _file_handler(path), _console, respect_handler_level=True
+    )
+
+    root = logging.getLogger()
+    root.setLevel(min(file_level, logging.INFO))
+    root.addHandler(_handler)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def flush_logging():
+    """Ждет, пока фоновый поток запишет все записи из очереди"""
+    if _queue is not None and _listener is not None:
+        _queue.join()
+
+
+def set_console_logging(enabled: bool):
+    """Включает или отключает вывод записей в консоль (в файл они пишутся всегда)"""
+    if _console is not None:
+        _console.setLevel(logging.INFO if enabled else logging.CRITICAL + 1)
+
+
+def dropped_records() -> int:
+    """Сколько записей отброшено из-за переполненной очереди"""
+    return _handler.dropped if _handler is not None else 0
+
+
+def shutdown_logging():
+    """Дописывает очередь, останавливает фоновый поток и закрывает файлы"""
+    global _queue, _handler, _listener, _console
+    if _listener is None:
+        return
+    _listener.stop()
+    logging.getLogger().removeHandler(_handler)
+    for handler in _listener.handlers:
+        handler.close()
+    if _handler.dropped:
+        print(f"⚠ Записей лога отброшено из-за переполненной очереди: {_handler.dropped}")
+    _queue = _handler = _listener = _console = None
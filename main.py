@@ -3,7 +3,9 @@
 """
 from colorama import init, Fore, Style
 from mode_manager import ModeManager
-from modes import mode_daily, mode_bet, mode_stats
+
+# Модули режимов (requests, eth_account и т.д.) импортируются только при выборе режима,
+# чтобы меню появлялось сразу
 
 init(autoreset=True)
 
@@ -62,14 +64,17 @@ if __name__ == "__main__":
                 
                 if mode == ModeManager.MODE_DAILY:
                     # Режим 2: Дейлик
+                    from modes import mode_daily
                     mode_daily(wallet_proxies)
                 
                 elif mode == ModeManager.MODE_BET:
                     # Режим 3: Ставки
+                    from modes import mode_bet
                     mode_bet(wallet_proxies)
                 
                 elif mode == ModeManager.MODE_STATS:
                     # Режим 4: Статистика
+                    from modes import mode_stats
                     mode_stats(wallet_proxies)
             
         except KeyboardInterrupt:
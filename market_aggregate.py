@@ -0,0 +1,217 @@
+"""
+Инкрементальные суммы ставок YES/NO по маркетам
+"""
+import threading
+from typing import Dict, Iterable, Iterator, Tuple
+
+
+def bet_key(bet: Dict):
+    """
+    Возвращает ключ для дедупликации ставки
+
+    Используется ID ставки, а если его нет - время ставки вместе с адресом,
+    суммой и исходом. Если нет ни ID, ни времени, ставку нельзя отличить от
+    такой же ставки того же адреса - возвращается None.
+    """
+    bet_id = bet.get('id', bet.get('_id', bet.get('betId')))
+    if bet_id is not None:
+        return bet_id
+    timestamp = bet.get('timestamp', bet.get('createdAt', bet.get('created_at')))
+    if timestamp is None:
+        return None
+    return (timestamp, bet.get('userAddress', bet.get('user')), bet.get('amount'), bet.get('outcome'))
+
+
+def anonymous_key(bet: Dict) -> tuple:
+    """Ключ ставки без ID и времени: одинаковые ставки различаются только количеством"""
+    return (bet.get('userAddress', bet.get('user')), bet.get('amount'), bet.get('outcome'))
+
+
+def bet_amount(bet: Dict) -> float:
+    """Сумма ставки (0, если она не число)"""
+    try:
+        return float(bet.get('amount', 0) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class MarketAggregate:
+    """
+    Накопленные суммы YES/NO одного маркета и ключи уже учтенных ставок
+
+    Подкласс может хранить и сами новые ставки: update передает каждую в
+    _collect, а накопленное публикуется в _publish под lock вместе с суммами.
+    """
+
+    def __init__(self):
+        self.yes_amount = 0.0
+        self.no_amount = 0.0
+        self.seen = set()
+        # Ставки без ID и времени: ключ -> сколько таких ставок было в одном ответе (максимум)
+        self.anonymous: Dict[tuple, int] = {}
+        self.last_snapshot = None  # Последний обработанный список ставок
+        self.lock = threading.Lock()  # Публикация новых ставок и чтение сумм
+        self._update_lock = threading.Lock()  # Одно обновление за раз (поток ставок читается под ним)
+
+    def _is_new(self, bet: Dict, new_keys: set, repeats: Dict[tuple, int]) -> bool:
+        """
+        Проверяет, новая ли ставка, и запоминает ее ключ в new_keys
+
+        Ставки без ID и времени не сливаются в одну: в repeats считается, сколько
+        одинаковых таких ставок в текущем ответе, и новыми считаются те, что
+        сверх максимума из прошлых ответов.
+        """
+        key = bet_key(bet)
+        if key is None:
+            anon = anonymous_key(bet)
+            count = repeats[anon] = repeats.get(anon, 0) + 1
+            return count > self.anonymous.get(anon, 0)
+        if key in self.seen or key in new_keys:
+            return False
+        new_keys.add(key)
+        return True
+
+    def _scan(self, bets, new_keys: set, repeats: Dict[tuple, int]) -> Iterator[Dict]:
+        """Отдает новые ставки из bets, останавливаясь на первой уже учтенной"""
+        for bet in bets:
+            if not self._is_new(bet, new_keys, repeats):
+                break
+            yield bet
+
+    def _scan_all(self, bets, new_keys: set, repeats: Dict[tuple, int]) -> Iterator[Dict]:
+        """Полный проход по всем ставкам с дедупликацией"""
+        for bet in bets:
+            if self._is_new(bet, new_keys, repeats):
+                yield bet
+
+    def _new_bets(self, bets: Iterable[Dict], new_keys: set, repeats: Dict[tuple, int]) -> Iterator[Dict]:
+        """
+        Отдает ставки, которых еще не было в агрегате, и собирает их ключи в new_keys и repeats
+
+        Новые ставки обычно дописываются в один из концов списка, поэтому
+        обход идет с этого конца и останавливается на первой знакомой ставке.
+        Если порядок определить нельзя (или ставки приходят потоком, или
+        среди учтенных есть ставки без ID и времени - их можно пересчитать
+        только по всему ответу), выполняется полный проход.
+        """
+        if not isinstance(bets, list) or self.anonymous:
+            return self._scan_all(bets, new_keys, repeats)
+        if not bets:
+            return iter(())
+
+        first_key = bet_key(bets[0])
+        last_key = bet_key(bets[-1])
+        if first_key is None or last_key is None or not self.seen:
+            return self._scan_all(bets, new_keys, repeats)
+
+        first_seen = first_key in self.seen
+        last_seen = last_key in self.seen
+        if first_seen and not last_seen:
+            # Новые ставки в конце списка
+            return self._scan(reversed(bets), new_keys, repeats)
+        if last_seen and not first_seen:
+            # Новые ставки в начале списка
+            return self._scan(bets, new_keys, repeats)
+        if first_seen and last_seen and len(bets) == len(self.seen):
+            return iter(())
+        return self._scan_all(bets, new_keys, repeats)
+
+    def _begin(self):
+        """Начало обновления (подкласс готовит буферы для новых ставок)"""
+
+    def _collect(self, bet: Dict, amount: float, outcome: str):
+        """Новая ставка с уже разобранными суммой и исходом (YES, NO или другое, в верхнем регистре)"""
+
+    def _publish(self):
+        """Публикует собранные ставки (вызывается под lock, если новые ставки были)"""
+
+    def update(self, bets: Iterable[Dict]) -> int:
+        """
+        Учитывает ставки, которых еще не было в агрегате
+
+        Ключи новых ставок попадают в seen только вместе с их суммами, после
+        того как поток прочитан целиком: если поток оборвался, ничего не
+        учитывается, и следующее обновление увидит эти ставки снова.
+
+        Args:
+            bets: Список ставок или поток (например, iter_market_bets)
+
+        Returns:
+            Количество новых учтенных ставок
+        """
+        if bets is self.last_snapshot:
+            return 0
+        with self._update_lock:
+            self._begin()
+            new_keys = set()
+            repeats: Dict[tuple, int] = {}
+            yes_amount = no_amount = 0.0
+            added = 0
+            for bet in self._new_bets(bets, new_keys, repeats):
+                amount = bet_amount(bet)
+                outcome = str(bet.get('outcome', '')).upper()
+                if outcome == 'YES':
+                    yes_amount += amount
+                elif outcome == 'NO':
+                    no_amount += amount
+                self._collect(bet, amount, outcome)
+                added += 1
+            if added:
+                with self.lock:
+                    self.seen.update(new_keys)
+                    for anon, count in repeats.items():
+                        if count > self.anonymous.get(anon, 0):
+                            self.anonymous[anon] = count
+                    self.yes_amount += yes_amount
+                    self.no_amount += no_amount
+                    self._publish()
+            self.last_snapshot = bets if isinstance(bets, list) else None
+            return added
+
+    def totals(self) -> Tuple[float, float]:
+        """
+        Суммы ставок по исходам (нарастающий итог, без прохода по ставкам)
+
+        Returns:
+            Кортеж (сумма YES, сумма NO)
+        """
+        with self.lock:
+            return self.yes_amount, self.no_amount
+
+
+class MarketAggregateStore:
+    """Хранилище агрегатов по всем маркетам (общее для всех трейдеров)"""
+
+    aggregate_class = MarketAggregate
+
+    def __init__(self):
+        self._aggregates: Dict[int, MarketAggregate] = {}
+        self._lock = threading.Lock()
+
+    def get(self, market_id: int) -> MarketAggregate:
+        """Возвращает агрегат маркета, создавая его при необходимости"""
+        with self._lock:
+            aggregate = self._aggregates.get(market_id)
+            if aggregate is None:
+                aggregate = self.aggregate_class()
+                self._aggregates[market_id] = aggregate
+            return aggregate
+
+    def update(self, market_id: int, bets: Iterable[Dict]) -> Tuple[float, float]:
+        """
+        Учитывает новые ставки маркета и возвращает суммы
+
+        Returns:
+            Кортеж (сумма YES, сумма NO)
+        """
+        aggregate = self.get(market_id)
+        aggregate.update(bets)
+        return aggregate.totals()
+
+    def reset(self, market_id: int = None):
+        """Сбрасывает агрегат маркета (или все агрегаты)"""
+        with self._lock:
+            if market_id is None:
+                self._aggregates.clear()
+            else:
+                self._aggregates.pop(market_id, None)
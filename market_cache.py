@@ -0,0 +1,105 @@
+"""
+Общий кеш снимков ставок маркетов для всех трейдеров
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+from config import MARKET_CACHE_TTL_SECONDS, MARKET_CACHE_MAX_SIZE
+
+
+class MarketBetsCache:
+    """
+    Кеш снимков ставок маркетов с TTL и вытеснением по LRU
+
+    Все кошельки выбирают маркеты из одного и того же списка, поэтому
+    снимок /market/{id}/bets скачивается один раз за TTL и переиспользуется.
+    """
+
+    def __init__(self, ttl: float = MARKET_CACHE_TTL_SECONDS, max_size: int = MARKET_CACHE_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max(1, max_size)
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()  # market_id -> (время загрузки, ставки)
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[int, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, market_id: int):
+        """Возвращает свежий снимок из кеша или None (вызывается под блокировкой)"""
+        entry = self._entries.get(market_id)
+        if entry is None:
+            return None
+        fetched_at, bets = entry
+        if time.time() - fetched_at > self.ttl:
+            del self._entries[market_id]
+            return None
+        self._entries.move_to_end(market_id)
+        return bets
+
+    def get(self, market_id: int, fetch: Callable[[int], Any]) -> Any:
+        """
+        Возвращает ставки маркета из кеша или загружает их через fetch
+
+        Args:
+            market_id: ID маркета
+            fetch: Функция загрузки ставок (например, WalletTrader._fetch_market_bets)
+
+        Returns:
+            Снимок ставок маркета (то, что вернула fetch, например MarketColumns)
+        """
+        with self._lock:
+            bets = self._lookup(market_id)
+            if bets is not None:
+                self.hits += 1
+                return bets
+            fetch_lock = self._fetch_locks.setdefault(market_id, threading.Lock())
+
+        # Один поток скачивает маркет, остальные ждут и получают его результат
+        with fetch_lock:
+            with self._lock:
+                bets = self._lookup(market_id)
+                if bets is not None:
+                    self.hits += 1
+                    return bets
+                self.misses += 1
+
+            bets = fetch(market_id)
+
+            with self._lock:
+                self._entries[market_id] = (time.time(), bets)
+                self._entries.move_to_end(market_id)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return bets
+
+    def invalidate(self, market_id: int = None):
+        """Удаляет снимок маркета (или весь кеш, если market_id не указан)"""
+        with self._lock:
+            if market_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(market_id, None)
+
+    def get_stats(self) -> Dict:
+        """Возвращает счетчики попаданий и промахов кеша"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+            }
+
+    def reset_stats(self):
+        """Сбрасывает счетчики (например, в начале новой итерации)"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+# Общий кеш для всех WalletTrader в процессе
+market_bets_cache = MarketBetsCache()
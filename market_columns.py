@@ -0,0 +1,158 @@
+"""
+Колоночное представление ставок маркета на NumPy
+"""
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+from market_aggregate import MarketAggregate, MarketAggregateStore
+
+# Коды исхода ставки
+OUTCOME_NO = -1
+OUTCOME_OTHER = 0
+OUTCOME_YES = 1
+
+_OUTCOME_CODES = {'YES': OUTCOME_YES, 'NO': OUTCOME_NO}
+
+# Метки времени больше этой - в миллисекундах (JS Date.now())
+_MS_THRESHOLD = 10 ** 11
+
+
+def bet_timestamp(bet: Dict) -> float:
+    """Время ставки в секундах unix time (NaN, если времени нет или формат не распознан)"""
+    value = bet.get('timestamp', bet.get('createdAt', bet.get('created_at')))
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value / 1000 if value > _MS_THRESHOLD else float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return float('nan')
+    return float('nan')
+
+
+def _grow(column: np.ndarray, size: int, extra: array, dtype) -> np.ndarray:
+    """Дописывает extra в колонку, увеличивая ее емкость вдвое при нехватке места"""
+    needed = size + len(extra)
+    if needed > len(column):
+        grown = np.empty(max(needed, 2 * len(column), 1024), dtype=dtype)
+        grown[:size] = column[:size]
+        column = grown
+    column[size:needed] = np.frombuffer(extra, dtype=dtype)
+    return column
+
+
+class MarketColumns(MarketAggregate):
+    """
+    Ставки одного маркета в виде колонок, которые только дописываются
+
+    amounts - суммы (float64), outcomes - коды исхода (int8: 1 YES, -1 NO, 0 прочее),
+    timestamps - время ставки в секундах (float64, NaN если неизвестно).
+    Занимает 17 байт на ставку (плюс ключ дедупликации) вместо сотен байт на
+    словарь. Дедупликацию и суммы YES/NO нарастающим итогом дает MarketAggregate,
+    поэтому при обновлении в колонки дописываются только новые ставки, и его
+    стоимость зависит от их числа, а не от размера маркета.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._amounts = np.empty(0, dtype=np.float64)
+        self._outcomes = np.empty(0, dtype=np.int8)
+        self._timestamps = np.empty(0, dtype=np.float64)
+        self._size = 0
+        self._pending = None  # Буферы новых ставок текущего обновления
+
+    @classmethod
+    def from_bets(cls, bets: Iterable[Dict]) -> 'MarketColumns':
+        """Строит колонки из ставок (списка или потока, например iter_market_bets)"""
+        columns = cls()
+        columns.update(bets)
+        return columns
+
+    def _begin(self):
+        # Ставки не накапливаются: каждая новая сразу раскладывается по компактным буферам
+        self._pending = (array('d'), array('b'), array('d'))
+
+    def _collect(self, bet: Dict, amount: float, outcome: str):
+        amounts, outcomes, timestamps = self._pending
+        amounts.append(amount)
+        outcomes.append(_OUTCOME_CODES.get(outcome, OUTCOME_OTHER))
+        timestamps.append(bet_timestamp(bet))
+
+    def _publish(self):
+        # Пока читается поток ставок, колонки доступны для чтения; новые ставки появляются в них разом
+        amounts, outcomes, timestamps = self._pending
+        self._amounts = _grow(self._amounts, self._size, amounts, np.float64)
+        self._outcomes = _grow(self._outcomes, self._size, outcomes, np.int8)
+        self._timestamps = _grow(self._timestamps, self._size, timestamps, np.float64)
+        self._size += len(amounts)
+        self._pending = None
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Согласованные колонки (amounts, outcomes, timestamps) на текущий момент"""
+        with self.lock:
+            size = self._size
+            return self._amounts[:size], self._outcomes[:size], self._timestamps[:size]
+
+    @property
+    def amounts(self) -> np.ndarray:
+        return self.snapshot()[0]
+
+    @property
+    def outcomes(self) -> np.ndarray:
+        return self.snapshot()[1]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.snapshot()[2]
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Объем памяти под колонки (байт, с учетом запаса емкости)"""
+        return self._amounts.nbytes + self._outcomes.nbytes + self._timestamps.nbytes
+
+    def imbalance(self) -> float:
+        """
+        Перекос объема между исходами: (YES - NO) / (YES + NO)
+
+        Returns:
+            Число от -1 (весь объем на NO) до 1 (весь объем на YES), 0 если ставок нет
+        """
+        yes_amount, no_amount = self.totals()
+        total = yes_amount + no_amount
+        return (yes_amount - no_amount) / total if total > 0 else 0.0
+
+    def recent_volume(self, window_seconds: float, now: Optional[float] = None) -> Tuple[float, float]:
+        """
+        Объем ставок по исходам за последние window_seconds секунд
+
+        Ставки без времени не учитываются.
+
+        Returns:
+            Кортеж (объем YES, объем NO)
+        """
+        now = now or time.time()
+        amounts, outcomes, timestamps = self.snapshot()
+        recent = timestamps >= now - window_seconds  # NaN дает False
+        return (float(amounts[recent & (outcomes == OUTCOME_YES)].sum()),
+                float(amounts[recent & (outcomes == OUTCOME_NO)].sum()))
+
+
+class MarketColumnsStore(MarketAggregateStore):
+    """Колонки по всем маркетам (общие для всех трейдеров, живут дольше кеша снимков)"""
+
+    aggregate_class = MarketColumns
+
+    def update(self, market_id: int, bets: Iterable[Dict]) -> MarketColumns:
+        """Дописывает новые ставки маркета и возвращает его колонки"""
+        columns = self.get(market_id)
+        columns.update(bets)
+        return columns
+
+
+# Общие колонки ставок для всех WalletTrader в процессе
+market_columns_store = MarketColumnsStore()
@@ -0,0 +1,182 @@
+"""
+Сохраняемый на диск индекс доступных маркетов
+"""
+import os
+import json
+import time
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+from config import MARKET_INDEX_FILE, MARKET_INDEX_TTL_SECONDS, MAX_AVAILABLE_MARKETS
+
+logger = logging.getLogger(__name__)
+
+
+class MarketIndex:
+    """
+    Индекс маркетов: доступность, время последней проверки и количество ставок
+
+    Загружается при старте за миллисекунды, чтобы не искать маркеты заново.
+    Устаревшие записи (старше TTL) перепроверяются, а маркеты, которых в индексе
+    нет, ищутся в фоне.
+    """
+
+    def __init__(self, path: str = MARKET_INDEX_FILE, ttl: float = MARKET_INDEX_TTL_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self.entries: Dict[int, Dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> int:
+        """
+        Загружает индекс из файла
+
+        Returns:
+            Количество загруженных записей
+        """
+        if not os.path.exists(self.path):
+            return 0
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            markets = data.get('markets', {}) if isinstance(data, dict) else {}
+            with self._lock:
+                self.entries = {int(market_id): entry for market_id, entry in markets.items()}
+            return len(self.entries)
+        except Exception as e:
+            logger.warning(f"⚠ Не удалось прочитать индекс маркетов {self.path}: {e}")
+            return 0
+
+    def save(self):
+        """Сохраняет индекс в файл (через временный файл, чтобы не повредить индекс при сбое)"""
+        with self._lock:
+            data = {'markets': {str(market_id): entry for market_id, entry in sorted(self.entries.items())}}
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"⚠ Не удалось сохранить индекс маркетов {self.path}: {e}")
+
+    def record(self, market_id: int, bet_count: Optional[int]):
+        """
+        Записывает результат проверки маркета
+
+        Args:
+            market_id: ID маркета
+            bet_count: Количество ставок или None, если маркет недоступен
+        """
+        with self._lock:
+            self.entries[market_id] = {
+                'available': bet_count is not None,
+                'checked_at': time.time(),
+                'bet_count': bet_count or 0,
+            }
+
+    def is_stale(self, market_id: int, now: float = None) -> bool:
+        """Проверяет, устарела ли запись маркета"""
+        entry = self.entries.get(market_id)
+        if entry is None:
+            return True
+        now = now or time.time()
+        return now - entry.get('checked_at', 0) > self.ttl
+
+    def available_markets(self, limit: int = None) -> List[int]:
+        """Возвращает доступные маркеты из индекса (включая устаревшие записи)"""
+        with self._lock:
+            markets = sorted(market_id for market_id, entry in self.entries.items() if entry.get('available'))
+        return markets[:limit] if limit is not None else markets
+
+    def stale_markets(self) -> List[int]:
+        """Возвращает ID маркетов с устаревшими записями"""
+        now = time.time()
+        with self._lock:
+            return sorted(market_id for market_id in self.entries if self.is_stale(market_id, now))
+
+    def unchecked_markets(self, market_ids: Iterable[int]) -> List[int]:
+        """Возвращает ID маркетов, которых еще нет в индексе (в исходном порядке)"""
+        with self._lock:
+            return [market_id for market_id in market_ids if market_id not in self.entries]
+
+    def revalidate_in_background(self, api, market_ids: Iterable[int] = (), limit: int = MAX_AVAILABLE_MARKETS,
+                                 on_update: Callable[[List[int]], None] = None) -> Optional[threading.Thread]:
+        """
+        Перепроверяет устаревшие записи и ищет новые маркеты в фоновом потоке, затем сохраняет индекс
+
+        Args:
+            api: PredictionMarketAPI для проверки маркетов
+            market_ids: Кандидаты; те, которых нет в индексе, проверяются, пока доступных меньше limit
+            limit: Сколько доступных маркетов нужно
+            on_update: Вызывается с новым списком доступных кандидатов (не больше limit),
+                если он изменился. Список каждый раз новый - старый не изменяется,
+                поэтому его можно подменять целиком, не мешая тем, кто его читает.
+
+        Returns:
+            Запущенный поток или None, если проверять нечего
+        """
+        market_ids = list(market_ids)
+        candidates = set(market_ids)
+        stale = self.stale_markets()
+        unchecked = self.unchecked_markets(market_ids)
+        if not stale and not unchecked:
+            return None
+
+        def current() -> List[int]:
+            return [market_id for market_id in self.available_markets() if market_id in candidates][:limit]
+
+        def worker():
+            before = current()
+            if stale:
+                api.discover_markets(stale, limit=len(stale), on_result=self.record, verbose=False)
+            missing = limit - len(current())
+            if unchecked and missing > 0:
+                api.discover_markets(unchecked, limit=missing, on_result=self.record, verbose=False)
+            self.save()
+            markets = current()
+            if on_update is not None and markets and markets != before:
+                on_update(markets)
+
+        thread = threading.Thread(target=worker, name="market-index-revalidate", daemon=True)
+        thread.start()
+        return thread
+
+
+def load_available_markets(api, market_ids: Iterable[int], limit: int = MAX_AVAILABLE_MARKETS,
+                           index: MarketIndex = None,
+                           on_update: Callable[[List[int]], None] = None) -> List[int]:
+    """
+    Возвращает доступные маркеты из индекса, а если индекс пуст - ищет их через API
+
+    Если маркеты взяты из индекса, в фоне перепроверяются устаревшие записи и
+    ищутся маркеты, которых в индексе еще нет.
+
+    Args:
+        api: PredictionMarketAPI для проверки маркетов
+        market_ids: ID маркетов-кандидатов
+        limit: Сколько маркетов нужно
+        index: Индекс маркетов (по умолчанию загружается из MARKET_INDEX_FILE)
+        on_update: Получает новый список маркетов, когда фоновая проверка его изменит
+
+    Returns:
+        Список доступных ID маркетов
+    """
+    if index is None:
+        index = MarketIndex()
+        index.load()
+
+    market_ids = list(market_ids)
+    candidates = set(market_ids)
+    markets = [market_id for market_id in index.available_markets() if market_id in candidates][:limit]
+    if markets:
+        stale_count = len(index.stale_markets())
+        unchecked_count = len(index.unchecked_markets(market_ids))
+        logger.info(f"  Маркеты загружены из индекса: {len(markets)} (устаревших записей: {stale_count}, "
+                    f"непроверенных: {unchecked_count}, проверяются в фоне)")
+        index.revalidate_in_background(api, market_ids, limit, on_update)
+        return markets
+
+    found = api.discover_markets(market_ids, limit, on_result=index.record)
+    index.save()
+    return list(found)
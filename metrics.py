@@ -0,0 +1,161 @@
+"""
+Метрики API клиента: количество запросов, задержки, объем ответов и коды статусов по endpoint'ам
+"""
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional
+from config import METRICS_DIR
+
+logger = logging.getLogger(__name__)
+
+# Границы корзин гистограммы задержек (миллисекунды)
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 75, 100, 150, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000, 30000]
+
+
+class EndpointMetrics:
+    """Метрики одного endpoint'а"""
+
+    def __init__(self):
+        self.count = 0
+        self.response_bytes = 0
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.statuses = Counter()
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)  # Последняя корзина - больше максимальной границы
+
+    def record(self, latency_ms: float, status, response_bytes: int):
+        self.count += 1
+        self.response_bytes += response_bytes
+        self.total_latency_ms += latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        self.statuses[str(status)] += 1
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Оценка перцентиля задержки по гистограмме (линейная интерполяция внутри корзины)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.histogram):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = LATENCY_BUCKETS_MS[index - 1] if index > 0 else 0.0
+                upper = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.max_latency_ms
+                upper = min(upper, self.max_latency_ms)
+                fraction = (rank - cumulative) / bucket_count
+                return lower + (max(upper, lower) - lower) * fraction
+            cumulative += bucket_count
+        return self.max_latency_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'response_bytes': self.response_bytes,
+            'latency_ms': {
+                'avg': self.total_latency_ms / self.count if self.count else 0.0,
+                'p50': self.percentile(0.50),
+                'p95': self.percentile(0.95),
+                'p99': self.percentile(0.99),
+                'max': self.max_latency_ms,
+            },
+            'histogram_ms': {
+                **{f"<={bound}": count for bound, count in zip(LATENCY_BUCKETS_MS, self.histogram)},
+                f">{LATENCY_BUCKETS_MS[-1]}": self.histogram[-1],
+            },
+            'statuses': dict(self.statuses),
+        }
+
+
+class ApiMetrics:
+    """Сборщик метрик по всем endpoint'ам (потокобезопасный)"""
+
+    def __init__(self):
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.in_flight = 0  # Сколько HTTP-запросов выполняется прямо сейчас
+
+    def request_started(self):
+        """Отмечает начало HTTP-запроса (для счетчика in_flight)"""
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self):
+        """Отмечает завершение HTTP-запроса"""
+        with self._lock:
+            self.in_flight -= 1
+
+    def record(self, endpoint: str, latency: float, status, response_bytes: int = 0):
+        """
+        Записывает результат одного HTTP-запроса
+
+        Args:
+            endpoint: Имя endpoint'а (bet, market_bets, stats, ...)
+            latency: Время запроса в секундах
+            status: HTTP код ответа или 'error' при сетевой ошибке
+            response_bytes: Размер тела ответа
+        """
+        with self._lock:
+            metrics = self._endpoints.get(endpoint)
+            if metrics is None:
+                metrics = EndpointMetrics()
+                self._endpoints[endpoint] = metrics
+            metrics.record(latency * 1000, status, response_bytes)
+
+    def add_bytes(self, endpoint: str, response_bytes: int):
+        """Добавляет байты ответа, прочитанные потоково после записи запроса"""
+        with self._lock:
+            metrics = self._endpoints.get(endpoint)
+            if metrics is not None:
+                metrics.response_bytes += response_bytes
+
+    def snapshot(self) -> Dict:
+        """Возвращает метрики всех endpoint'ов в виде словаря"""
+        with self._lock:
+            endpoints = {name: metrics.to_dict() for name, metrics in sorted(self._endpoints.items())}
+        elapsed = time.time() - self.started_at
+        total = sum(data['count'] for data in endpoints.values())
+        return {
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+            'elapsed_seconds': elapsed,
+            'total_requests': total,
+            'requests_per_second': total / elapsed if elapsed > 0 else 0.0,
+            'endpoints': endpoints,
+        }
+
+    def export_json(self, name: str, directory: str = METRICS_DIR) -> Optional[str]:
+        """
+        Сохраняет метрики в JSON файл
+
+        Args:
+            name: Имя режима (попадает в имя файла)
+            directory: Папка для файлов метрик
+
+        Returns:
+            Путь к файлу или None при ошибке
+        """
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            return path
+        except Exception as e:
+            logger.warning(f"⚠ Не удалось сохранить метрики: {e}")
+            return None
+
+    def reset(self):
+        """Сбрасывает все метрики"""
+        with self._lock:
+            self._endpoints.clear()
+            self.started_at = time.time()
+
+
+# Общий сборщик метрик для всех API клиентов в процессе
+api_metrics = ApiMetrics()
@@ -0,0 +1,397 @@
+"""
+Локальный тестовый сервер, повторяющий API предикшн маркета
+
+Нужен для нагрузочных тестов и бенчмарков без обращения к настоящему API.
+Запуск:
+    python mock_server.py --port 8787 --latency 0.05 --error-rate 0.01
+
+После запуска укажите в .env:
+    API_BASE_URL=http://127.0.0.1:8787/api
+    SITE_URL=http://127.0.0.1:8787
+"""
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import Counter, deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+DAILY_COOLDOWN_SECONDS = 24 * 60 * 60
+DAILY_XP = 50
+BET_XP = 10
+
+_ROUTES = [
+    ('POST', re.compile(r'^/user/bet$'), 'bet'),
+    ('GET', re.compile(r'^/user/(?P<address>0x[0-9a-fA-F]+)/bets$'), 'user_bets'),
+    ('GET', re.compile(r'^/user/(?P<address>0x[0-9a-fA-F]+)/stats$'), 'stats'),
+    ('POST', re.compile(r'^/user/(?P<address>0x[0-9a-fA-F]+)/claim-daily$'), 'claim_daily'),
+    ('GET', re.compile(r'^/user/(?P<address>0x[0-9a-fA-F]+)/achievements$'), 'achievements'),
+    ('GET', re.compile(r'^/market/(?P<market_id>\d+)/bets$'), 'market_bets'),
+    ('GET', re.compile(r'^/market/(?P<market_id>\d+)$'), 'market_info'),
+    ('GET', re.compile(r'^/$'), 'referral'),
+]
+
+
+class MarketState:
+    """Состояние сервера в памяти: маркеты, ставки и пользователи"""
+
+    def __init__(self, markets: int, market_size: int, first_market_id: int = 1):
+        self.lock = threading.Lock()
+        self.next_bet_id = 1
+        self.markets: Dict[int, List[Dict]] = {}
+        self.market_bodies: Dict[int, bytes] = {}  # Сериализованные списки ставок
+        self.users: Dict[str, Dict] = {}
+        self.user_bets: Dict[str, List[Dict]] = {}
+
+        now = time.time()
+        for market_id in range(first_market_id, first_market_id + markets):
+            bets = []
+            for _ in range(market_size):
+                bets.append(self._new_bet(
+                    market_id, '0x' + '%040x' % random.getrandbits(160),
+                    round(random.uniform(0.01, 1.0), 2), random.choice(['YES', 'NO']),
+                    now - random.uniform(0, 7 * 24 * 3600)
+                ))
+            bets.sort(key=lambda bet: bet['timestamp'])
+            self.markets[market_id] = bets
+
+    def _new_bet(self, market_id: int, address: str, amount: float, outcome: str, timestamp: float) -> Dict:
+        bet = {
+            'id': self.next_bet_id,
+            'marketId': market_id,
+            'userAddress': address,
+            'amount': amount,
+            'outcome': outcome,
+            'timestamp': int(timestamp * 1000),
+        }
+        self.next_bet_id += 1
+        return bet
+
+    def user(self, address: str) -> Dict:
+        address = address.lower()
+        user = self.users.get(address)
+        if user is None:
+            user = {'xp': 0, 'level': 1, 'totalBets': 0, 'lastDailyClaim': None}
+            self.users[address] = user
+        return user
+
+    def market_body(self, market_id: int) -> Optional[bytes]:
+        """Тело ответа /market/{id}/bets (сериализуется один раз до следующей ставки)"""
+        with self.lock:
+            if market_id not in self.markets:
+                return None
+            body = self.market_bodies.get(market_id)
+            if body is None:
+                body = json.dumps(self.markets[market_id], separators=(',', ':')).encode('utf-8')
+                self.market_bodies[market_id] = body
+            return body
+
+    def place_bet(self, address: str, market_id: int, amount: float, outcome: str) -> Optional[Dict]:
+        with self.lock:
+            if market_id not in self.markets:
+                return None
+            bet = self._new_bet(market_id, address, amount, outcome, time.time())
+            self.markets[market_id].append(bet)
+            self.market_bodies.pop(market_id, None)
+            self.user_bets.setdefault(address.lower(), []).append(bet)
+            user = self.user(address)
+            user['xp'] += BET_XP
+            user['totalBets'] += 1
+            user['level'] = 1 + user['xp'] // 500
+            return bet
+
+    def claim_daily(self, address: str) -> Dict:
+        """Возвращает {'success': True, ...} или {'error': ..., 'nextClaimAt': ...}"""
+        with self.lock:
+            user = self.user(address)
+            now = time.time()
+            last_claim = user['lastDailyClaim']
+            if last_claim and now - last_claim < DAILY_COOLDOWN_SECONDS:
+                next_claim = last_claim + DAILY_COOLDOWN_SECONDS
+                return {
+                    'success': False,
+                    'error': 'Already claimed today. Come back tomorrow!',
+                    'nextClaimAt': int(next_claim * 1000),
+                }
+            user['lastDailyClaim'] = now
+            user['xp'] += DAILY_XP
+            user['level'] = 1 + user['xp'] // 500
+            return {'success': True, 'message': f'Daily reward claimed: +{DAILY_XP} XP', 'xp': user['xp']}
+
+
+class MockServerConfig:
+    """Параметры поведения тестового сервера"""
+
+    def __init__(self, latency: float = 0.0, latency_jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit: float = 0.0, burst_every: float = 0.0, burst_duration: float = 0.0,
+                 retry_after: float = 1.0):
+        self.latency = latency  # Базовая задержка ответа (сек)
+        self.latency_jitter = latency_jitter  # Случайная добавка к задержке (сек)
+        self.error_rate = error_rate  # Доля ответов 500
+        self.rate_limit = rate_limit  # Запросов в секунду до ответа 429 (0 - без лимита)
+        self.burst_every = burst_every  # Раз в сколько секунд начинается всплеск 429 (0 - без всплесков)
+        self.burst_duration = burst_duration  # Длительность всплеска 429 (сек)
+        self.retry_after = retry_after  # Значение Retry-After в ответах 429 (сек)
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов тестового сервера"""
+
+    protocol_version = 'HTTP/1.1'  # Поддержка keep-alive
+    disable_nagle_algorithm = True  # Заголовки и тело пишутся отдельно - без этого +40 мс на ответ
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, data=None, body: bytes = None, headers: Dict = None):
+        if body is None:
+            body = json.dumps(data, separators=(',', ':')).encode('utf-8') if data is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            data = json.loads(self.rfile.read(length))
+            return data if isinstance(data, dict) else {}
+        except ValueError:
+            return {}
+
+    def _route(self, method: str):
+        path = self.path.split('?', 1)[0]
+        if path.startswith('/api/'):
+            path = path[4:]
+        for route_method, pattern, name in _ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                return name, match.groupdict()
+        return None, {}
+
+    def _handle(self, method: str):
+        server: MockMarketServer = self.server.mock
+        name, params = self._route(method)
+        body = self._read_json() if method == 'POST' else {}
+        server.count(name or 'unknown')
+
+        # Имитация задержки сети и сервера
+        config = server.config
+        if config.latency or config.latency_jitter:
+            time.sleep(config.latency + random.uniform(0, config.latency_jitter))
+
+        if name is None:
+            self._send_json(404, {'error': 'Not found'})
+            return
+        if server.throttled():
+            self._send_json(429, {'error': 'Too many requests'}, headers={'Retry-After': str(config.retry_after)})
+            return
+        if config.error_rate and random.random() < config.error_rate:
+            self._send_json(500, {'error': 'Internal server error'})
+            return
+
+        getattr(self, f"_handle_{name}")(server.state, body, **params)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def _handle_referral(self, state: MarketState, body: Dict):
+        html = b'<html><body>Prediction market</body></html>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(html)))
+        self.end_headers()
+        self.wfile.write(html)
+
+    def _handle_bet(self, state: MarketState, body: Dict):
+        try:
+            market_id = int(body.get('marketId'))
+            amount = float(body.get('amount'))
+            outcome = str(body.get('position', '')).upper()
+            address = str(body.get('userAddress', ''))
+        except (TypeError, ValueError):
+            self._send_json(400, {'error': 'Invalid bet'})
+            return
+        if outcome not in ('YES', 'NO') or not address or amount <= 0:
+            self._send_json(400, {'error': 'Invalid bet'})
+            return
+        bet = state.place_bet(address, market_id, amount, outcome)
+        if bet is None:
+            self._send_json(404, {'error': 'Market not found'})
+            return
+        self._send_json(200, {'success': True, 'bet': bet})
+
+    def _handle_user_bets(self, state: MarketState, body: Dict, address: str):
+        with state.lock:
+            bets = list(state.user_bets.get(address.lower(), []))
+        self._send_json(200, bets)
+
+    def _handle_stats(self, state: MarketState, body: Dict, address: str):
+        with state.lock:
+            stats = dict(state.user(address))
+        if stats['lastDailyClaim']:
+            stats['lastDailyClaim'] = datetime.fromtimestamp(stats['lastDailyClaim'], timezone.utc).isoformat().replace('+00:00', 'Z')
+        payload = json.dumps({'success': True, 'stats': stats}, separators=(',', ':')).encode('utf-8')
+        etag = '"' + hashlib.md5(payload).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self._send_json(304, body=b'', headers={'ETag': etag})
+            return
+        self._send_json(200, body=payload, headers={'ETag': etag})
+
+    def _handle_claim_daily(self, state: MarketState, body: Dict, address: str):
+        result = state.claim_daily(address)
+        self._send_json(200 if result.get('success') else 400, result)
+
+    def _handle_achievements(self, state: MarketState, body: Dict, address: str):
+        with state.lock:
+            user = dict(state.user(address))
+        achievements = []
+        if user['totalBets'] >= 1:
+            achievements.append({'id': 'first_bet', 'name': 'First bet'})
+        if user['lastDailyClaim']:
+            achievements.append({'id': 'daily', 'name': 'Daily claimer'})
+        self._send_json(200, achievements)
+
+    def _handle_market_bets(self, state: MarketState, body: Dict, market_id: str):
+        payload = state.market_body(int(market_id))
+        if payload is None:
+            self._send_json(404, {'error': 'Market not found'})
+            return
+        self._send_json(200, body=payload)
+
+    def _handle_market_info(self, state: MarketState, body: Dict, market_id: str):
+        market_id = int(market_id)
+        with state.lock:
+            bets = state.markets.get(market_id)
+            if bets is None:
+                info = None
+            else:
+                info = {
+                    'id': market_id,
+                    'question': f'Test market #{market_id}',
+                    'totalBets': len(bets),
+                    'yesAmount': sum(bet['amount'] for bet in bets if bet['outcome'] == 'YES'),
+                    'noAmount': sum(bet['amount'] for bet in bets if bet['outcome'] == 'NO'),
+                }
+        if info is None:
+            self._send_json(404, {'error': 'Market not found'})
+            return
+        self._send_json(200, info)
+
+
+class MockMarketServer:
+    """
+    Тестовый сервер в фоновом потоке
+
+    Пример:
+        server = MockMarketServer(markets=20, market_size=1000, config=MockServerConfig(latency=0.05))
+        server.start()
+        ...  # API_BASE_URL = server.api_url
+        server.stop()
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, markets: int = 20, market_size: int = 100,
+                 first_market_id: int = 1, config: MockServerConfig = None):
+        self.config = config or MockServerConfig()
+        self.state = MarketState(markets, market_size, first_market_id)
+        self.httpd = ThreadingHTTPServer((host, port), MockRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._recent = deque()  # Время последних запросов для лимита частоты
+        self._started_at = time.time()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.url}/api"
+
+    def count(self, endpoint: str):
+        with self._lock:
+            self.requests[endpoint] += 1
+
+    def throttled(self) -> bool:
+        """Проверяет, нужно ли ответить 429 (всплеск или превышение лимита частоты)"""
+        config = self.config
+        now = time.time()
+        if config.burst_every and config.burst_duration:
+            if (now - self._started_at) % config.burst_every < config.burst_duration:
+                return True
+        if config.rate_limit:
+            with self._lock:
+                while self._recent and now - self._recent[0] > 1.0:
+                    self._recent.popleft()
+                if len(self._recent) >= config.rate_limit:
+                    return True
+                self._recent.append(now)
+        return False
+
+    def start(self) -> 'MockMarketServer':
+        self._started_at = time.time()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='mock-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return dict(self.requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный тестовый сервер API предикшн маркета")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--markets', type=int, default=20, help='Количество маркетов')
+    parser.add_argument('--market-size', type=int, default=100, help='Начальное количество ставок на маркете')
+    parser.add_argument('--first-market-id', type=int, default=1, help='ID первого маркета')
+    parser.add_argument('--latency', type=float, default=0.0, help='Базовая задержка ответа, сек')
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help='Случайная добавка к задержке, сек')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Доля ответов 500 (0..1)')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='Запросов в секунду до ответа 429 (0 - без лимита)')
+    parser.add_argument('--burst-every', type=float, default=0.0, help='Период всплесков 429, сек')
+    parser.add_argument('--burst-duration', type=float, default=0.0, help='Длительность всплеска 429, сек')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After в ответах 429, сек')
+    args = parser.parse_args()
+
+    config = MockServerConfig(
+        latency=args.latency, latency_jitter=args.latency_jitter, error_rate=args.error_rate,
+        rate_limit=args.rate_limit, burst_every=args.burst_every, burst_duration=args.burst_duration,
+        retry_after=args.retry_after
+    )
+    print(f"Генерация {args.markets} маркетов по {args.market_size} ставок...")
+    server = MockMarketServer(args.host, args.port, args.markets, args.market_size, args.first_market_id, config)
+    print(f"Тестовый сервер запущен: {server.api_url}")
+    print(f"  API_BASE_URL={server.api_url}")
+    print(f"  SITE_URL={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nОстановлено. Запросов: {dict(server.get_stats())}")
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
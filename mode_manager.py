@@ -5,7 +5,6 @@ import os
 from typing import List, Optional
 from colorama import init, Fore, Style
 from wallet_manager import WalletManager
-from crypto_utils import verify_address_from_key
 
 init(autoreset=True)
 
@@ -118,15 +117,17 @@ class ModeManager:
         print(f"  - Прокси: {sum(1 for p in proxies if p)}{Style.RESET_ALL}\n")
         
         print(f"{Fore.CYAN}Извлеченные адреса кошельков:{Style.RESET_ALL}")
+        from address_cache import derive_addresses
+        
         valid_wallets = []
-        for i, key in enumerate(private_keys, 1):
-            try:
-                address = verify_address_from_key(key)
+        derived = derive_addresses(private_keys)
+        for i, (key, (address, error)) in enumerate(zip(private_keys, derived), 1):
+            if address:
                 proxy_info = f" (прокси: {proxies[i-1]})" if proxies[i-1] else " (без прокси)"
                 print(f"  {Fore.GREEN}{i}. {address}{Style.RESET_ALL}{proxy_info}")
                 valid_wallets.append((address, key, proxies[i-1] if i <= len(proxies) else None))
-            except Exception as e:
-                print(f"  {Fore.RED}{i}. Ошибка при извлечении адреса: {e}{Style.RESET_ALL}")
+            else:
+                print(f"  {Fore.RED}{i}. Ошибка при извлечении адреса: {error}{Style.RESET_ALL}")
         
         if valid_wallets:
             print(f"\n{Fore.GREEN}✓ Успешно загружено {len(valid_wallets)} кошельков{Style.RESET_ALL}")
@@ -3,16 +3,93 @@
 """
 import time
 import random
-from typing import List
+from datetime import datetime
+from typing import Dict, List, Tuple
 from colorama import init, Fore, Style
 from api_client import PredictionMarketAPI
+from session_registry import session_registry
+from metrics import api_metrics
+from http_cache import user_stats_cache
 from wallet_manager import WalletProxy
+from fleet_runner import run_fleet
+from stats_export import StatsExporter
+from daily_schedule import daily_schedule
+from logging_setup import flush_logging
+from config import FLEET_WORKERS, FLEET_PER_PROXY_CONCURRENCY, DAILY_RETRY_SECONDS, DAILY_WATCH
 
 init(autoreset=True)
 
 
+def _export_metrics(mode_name: str):
+    """Сохраняет метрики запросов режима в JSON"""
+    path = api_metrics.export_json(mode_name)
+    if path:
+        print(f"Метрики запросов сохранены: {path}")
+
+
+def _claim_daily_for_wallet(wallet_proxy: WalletProxy) -> Tuple[str, str]:
+    """
+    Регистрация под рефкодом, проверка CD и клейм дейлика для одного кошелька
+    
+    Returns:
+        Кортеж (статус, сообщение), статус: 'claimed', 'cooldown' или 'failed'
+    """
+    api = PredictionMarketAPI(
+        wallet_proxy.wallet_address,
+        wallet_proxy.private_key,
+        wallet_proxy.proxy
+    )
+    
+    # Регистрация с реферальным кодом (всегда используется)
+    REFERRAL_CODE = "BA08NOBF"
+    if REFERRAL_CODE:
+        try:
+            api.register_with_referral(REFERRAL_CODE)
+        except Exception:
+            pass  # Реферальный код необязателен для клейма
+    
+    try:
+        # Проверяем CD
+        cd_info = api.check_daily_cooldown(wallet_proxy.wallet_address)
+        if cd_info is not None:
+            return 'cooldown', "Дейлик в кулдауне, пропускаем"
+        
+        # Клеймим дейлик
+        result = api.claim_daily(wallet_proxy.wallet_address)
+        message = result['message'] if isinstance(result, dict) and 'message' in result else ""
+        return 'claimed', message
+    except Exception as e:
+        error_msg = str(e)
+        error_lower = error_msg.lower()
+        if 'кулдаун' in error_lower or 'cooldown' in error_lower or 'already claimed' in error_lower or 'come back tomorrow' in error_lower:
+            return 'cooldown', error_msg
+        return 'failed', error_msg
+
+
+def _format_wait(seconds: float) -> str:
+    """Форматирует время ожидания как Ч:ММ:СС"""
+    seconds = max(0, int(seconds))
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _claim_daily_round(wallet_proxies: List[WalletProxy], summary: Dict[str, int], retry_at: Dict[str, float]):
+    """Клеймит дейлик у переданных кошельков параллельно и дополняет итоги"""
+    for i, (wallet_proxy, result, error) in enumerate(run_fleet(wallet_proxies, _claim_daily_for_wallet), 1):
+        status, message = result if error is None else ('failed', str(error))
+        summary[status] += 1
+        if status == 'failed':
+            retry_at[wallet_proxy.wallet_address] = time.time() + DAILY_RETRY_SECONDS
+        prefix = f"[{i}/{len(wallet_proxies)}] {wallet_proxy.wallet_address[:10]}..."
+        if status == 'claimed':
+            print(f"{prefix} {Fore.GREEN}✓ Дейлик успешно клеймлен!{Style.RESET_ALL} {message}")
+        elif status == 'cooldown':
+            print(f"{prefix} {Fore.YELLOW}⚠ {message}{Style.RESET_ALL}")
+        else:
+            print(f"{prefix} {Fore.RED}✗ Ошибка: {message}{Style.RESET_ALL}")
+
+
 def mode_daily(wallet_proxies: List[WalletProxy]):
-    """Режим 2: Клейм дейлика с проверкой CD"""
+    """Режим 2: Клейм дейлика (кошельки в кулдауне по локальному расписанию пропускаются без запросов)"""
     print(f"\n{Fore.CYAN}{'='*60}")
     print(f"{Fore.CYAN}  РЕЖИМ: ДЕЙЛИК")
     print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}\n")
@@ -21,59 +98,106 @@ def mode_daily(wallet_proxies: List[WalletProxy]):
         print(f"{Fore.RED}Нет кошельков для работы. Используйте режим 1 для настройки.{Style.RESET_ALL}")
         return
     
-    for i, wallet_proxy in enumerate(wallet_proxies, 1):
-        print(f"\n{Fore.YELLOW}[{i}/{len(wallet_proxies)}] Кошелек: {wallet_proxy.wallet_address[:10]}...{Style.RESET_ALL}")
-        
-        api = PredictionMarketAPI(
-            wallet_proxy.wallet_address,
-            wallet_proxy.private_key,
-            wallet_proxy.proxy
-        )
-        
-        # Регистрация с реферальным кодом (всегда используется)
-        REFERRAL_CODE = "BA08NOBF"
-        if REFERRAL_CODE:
-            try:
-                print(f"  Регистрация с реферальным кодом {REFERRAL_CODE}...")
-                api.register_with_referral(REFERRAL_CODE)
-                print(f"  {Fore.GREEN}✓ Реферальный код установлен{Style.RESET_ALL}")
-            except Exception as e:
-                print(f"  {Fore.YELLOW}⚠ Не удалось установить реферальный код: {e}{Style.RESET_ALL}")
-        
-        try:
-            # Проверяем CD
-            print(f"  Проверка кулдауна...")
-            cd_info = api.check_daily_cooldown(wallet_proxy.wallet_address)
+    api_metrics.reset()
+    
+    start_time = time.time()
+    summary = {'claimed': 0, 'cooldown': 0, 'failed': 0, 'skipped': 0}
+    retry_at: Dict[str, float] = {}  # Когда повторить клейм после ошибки (режим ожидания)
+    first_round = True
+    try:
+        while True:
+            now = time.time()
+            due = [
+                wallet_proxy for wallet_proxy in wallet_proxies
+                if daily_schedule.is_due(wallet_proxy.wallet_address, now)
+                and retry_at.get(wallet_proxy.wallet_address, 0) <= now
+            ]
+            if first_round:
+                summary['skipped'] = len(wallet_proxies) - len(due)
+                if summary['skipped']:
+                    print(f"{Fore.YELLOW}Пропущено по расписанию (дейлик в кулдауне): {summary['skipped']}{Style.RESET_ALL}")
+                first_round = False
             
-            if cd_info is not None:
-                print(f"  {Fore.YELLOW}⚠ Дейлик в кулдауне, пропускаем{Style.RESET_ALL}")
-                continue
+            if due:
+                print(f"{Fore.YELLOW}Клейм дейлика для {len(due)} кошельков "
+                      f"(потоков: {FLEET_WORKERS}, на прокси: {FLEET_PER_PROXY_CONCURRENCY})...{Style.RESET_ALL}\n")
+                _claim_daily_round(due, summary, retry_at)
+            daily_schedule.save()
             
-            # Клеймим дейлик
-            print(f"  Клейм дейлика...")
-            result = api.claim_daily(wallet_proxy.wallet_address)
+            if not DAILY_WATCH:
+                break
             
-            print(f"  {Fore.GREEN}✓ Дейлик успешно клеймлен!{Style.RESET_ALL}")
-            if isinstance(result, dict) and 'message' in result:
-                print(f"    Сообщение: {result['message']}")
-                    
-        except Exception as e:
-            error_msg = str(e)
-            error_lower = error_msg.lower()
-            if 'кулдаун' in error_lower or 'cooldown' in error_lower or 'already claimed' in error_lower or 'come back tomorrow' in error_lower:
-                print(f"  {Fore.YELLOW}⚠ {error_msg}{Style.RESET_ALL}")
-            else:
-                print(f"  {Fore.RED}✗ Ошибка: {error_msg}{Style.RESET_ALL}")
-        
-        # Пауза между кошельками
-        if i < len(wallet_proxies):
-            time.sleep(2)
+            # Спим до момента, когда дейлик станет доступен у ближайшего кошелька
+            wake_at = min(
+                max(daily_schedule.next_claim_at(wallet_proxy.wallet_address) or 0,
+                    retry_at.get(wallet_proxy.wallet_address, 0))
+                for wallet_proxy in wallet_proxies
+            )
+            wait = max(1.0, wake_at - time.time())
+            wake_time = datetime.fromtimestamp(time.time() + wait).strftime('%H:%M:%S')
+            print(f"\n{Fore.CYAN}Следующий клейм через {_format_wait(wait)} (в {wake_time}). Ctrl+C - выход{Style.RESET_ALL}")
+            time.sleep(wait)
+    except KeyboardInterrupt:
+        print(f"\n{Fore.YELLOW}Остановлено пользователем.{Style.RESET_ALL}")
+    finally:
+        daily_schedule.save()
     
+    elapsed = time.time() - start_time
+    print(f"\n{Fore.CYAN}Итог:{Style.RESET_ALL} клеймлено {Fore.GREEN}{summary['claimed']}{Style.RESET_ALL}, "
+          f"в кулдауне {Fore.YELLOW}{summary['cooldown'] + summary['skipped']}{Style.RESET_ALL} "
+          f"(из них без запросов: {summary['skipped']}), "
+          f"ошибок {Fore.RED}{summary['failed']}{Style.RESET_ALL}, время {elapsed:.1f} сек")
+    if not DAILY_WATCH:
+        next_at = daily_schedule.next_due_at(wallet_proxy.wallet_address for wallet_proxy in wallet_proxies)
+        if next_at and next_at > time.time():
+            print(f"Ближайший дейлик станет доступен через {_format_wait(next_at - time.time())}")
+    print(f"{session_registry.describe()}")
+    _export_metrics("daily")
     print(f"\n{Fore.CYAN}Завершено.{Style.RESET_ALL}\n")
 
 
+def _extract_xp(stats) -> Tuple[int, object]:
+    """
+    Достает XP и уровень из ответа /user/{address}/stats
+    
+    Returns:
+        Кортеж (XP, уровень или None)
+    """
+    if not stats or not isinstance(stats, dict):
+        return 0, None
+    
+    # API возвращает структуру: {'success': True, 'stats': {'xp': 50, ...}}
+    # Нужно извлечь данные из вложенного словаря 'stats'
+    stats_dict = stats.get('stats', stats)  # Если есть 'stats', используем его, иначе сам словарь
+    if not isinstance(stats_dict, dict):
+        return 0, None
+    
+    # Пробуем разные варианты названий поля XP
+    xp = (stats_dict.get('xp') or stats_dict.get('XP') or stats_dict.get('experience') or 
+          stats_dict.get('Experience') or stats_dict.get('points') or stats_dict.get('Points') or
+          stats_dict.get('totalXp') or stats_dict.get('totalXP') or stats_dict.get('total_xp'))
+    level = stats_dict.get('level', stats_dict.get('Level'))
+    
+    # Если это число, используем его, иначе 0
+    try:
+        xp = int(float(xp)) if isinstance(xp, (int, float, str)) else 0
+    except (ValueError, TypeError):
+        xp = 0
+    return xp, level
+
+
+def _fetch_wallet_stats(wallet_proxy: WalletProxy) -> Tuple[int, object]:
+    """Запрашивает статистику кошелька и возвращает (XP, уровень)"""
+    api = PredictionMarketAPI(
+        wallet_proxy.wallet_address,
+        wallet_proxy.private_key,
+        wallet_proxy.proxy
+    )
+    return _extract_xp(api.get_user_stats(wallet_proxy.wallet_address))
+
+
 def mode_stats(wallet_proxies: List[WalletProxy]):
-    """Режим 4: Сбор статистики по всем аккаунтам"""
+    """Режим 4: Сбор статистики по всем аккаунтам (параллельно, с потоковой выгрузкой в файл)"""
     print(f"\n{Fore.CYAN}{'='*60}")
     print(f"{Fore.CYAN}  РЕЖИМ: СТАТИСТИКА")
     print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}\n")
@@ -82,71 +206,53 @@ def mode_stats(wallet_proxies: List[WalletProxy]):
         print(f"{Fore.RED}Нет кошельков для работы. Используйте режим 1 для настройки.{Style.RESET_ALL}")
         return
     
-    # Собираем статистику по всем кошелькам
-    stats_data = []
+    api_metrics.reset()
+    user_stats_cache.reset_stats()  # Итоги 304 только за этот запуск, сами ETag остаются
+    
+    # Строки не копятся в памяти: каждая сразу пишется в файл, а в памяти только нарастающие итоги
     total_xp = 0
+    processed = 0
+    failed = 0
+    max_xp = None
+    min_xp = None
+    start_time = time.time()
+    position = {id(wallet_proxy): index for index, wallet_proxy in enumerate(wallet_proxies, 1)}
     
-    print(f"{Fore.YELLOW}Сбор статистики по {len(wallet_proxies)} кошелькам...{Style.RESET_ALL}\n")
+    print(f"{Fore.YELLOW}Сбор статистики по {len(wallet_proxies)} кошелькам "
+          f"(потоков: {FLEET_WORKERS}, на прокси: {FLEET_PER_PROXY_CONCURRENCY})...{Style.RESET_ALL}\n")
     
-    for i, wallet_proxy in enumerate(wallet_proxies, 1):
-        wallet_address = wallet_proxy.wallet_address
-        print(f"[{i}/{len(wallet_proxies)}] {wallet_address[:10]}...", end=" ", flush=True)
-        
-        api = PredictionMarketAPI(
-            wallet_proxy.wallet_address,
-            wallet_proxy.private_key,
-            wallet_proxy.proxy
-        )
-        
-        xp = 0
-        
+    with StatsExporter() as exporter:
         try:
-            # Получаем статистику (XP)
-            stats = api.get_user_stats(wallet_address)
-            
-            if stats and isinstance(stats, dict):
-                # API возвращает структуру: {'success': True, 'stats': {'xp': 50, ...}}
-                # Нужно извлечь данные из вложенного словаря 'stats'
-                stats_dict = stats.get('stats', stats)  # Если есть 'stats', используем его, иначе сам словарь
+            for wallet_proxy, result, error in run_fleet(wallet_proxies, _fetch_wallet_stats):
+                wallet_address = wallet_proxy.wallet_address
+                processed += 1
+                xp, level = result if error is None else (0, None)
+                if error is not None:
+                    failed += 1
+                total_xp += xp
+                max_xp = xp if max_xp is None else max(max_xp, xp)
+                min_xp = xp if min_xp is None else min(min_xp, xp)
+                avg_xp = total_xp / processed
                 
-                if isinstance(stats_dict, dict):
-                    # Пробуем разные варианты названий поля XP
-                    xp = (stats_dict.get('xp') or stats_dict.get('XP') or stats_dict.get('experience') or 
-                          stats_dict.get('Experience') or stats_dict.get('points') or stats_dict.get('Points') or
-                          stats_dict.get('totalXp') or stats_dict.get('totalXP') or stats_dict.get('total_xp'))
-                    
-                    # Если это число, используем его, иначе 0
-                    if xp is None:
-                        xp = 0
-                    else:
-                        try:
-                            xp = int(float(xp)) if isinstance(xp, (int, float, str)) else 0
-                        except (ValueError, TypeError):
-                            xp = 0
+                exporter.write({
+                    'index': position[id(wallet_proxy)],
+                    'address': wallet_address,
+                    'xp': xp,
+                    'level': level,
+                    'error': str(error) if error is not None else '',
+                    'total_xp': total_xp,
+                    'avg_xp': round(avg_xp, 2),
+                })
+                
+                # Выводим результат для этого кошелька и нарастающие итоги
+                prefix = f"[{processed}/{len(wallet_proxies)}] {wallet_address[:10]}..."
+                if error is not None:
+                    print(f"{prefix} {Fore.RED}✗ Ошибка получения XP: {error}{Style.RESET_ALL}")
                 else:
-                    xp = 0
-            else:
-                xp = 0
-        except Exception as e:
-            print(f"{Fore.RED}✗ Ошибка получения XP: {e}{Style.RESET_ALL}")
-            import traceback
-            traceback.print_exc()
-            xp = 0
-        
-        # Сохраняем данные
-        stats_data.append({
-            'address': wallet_address,
-            'xp': xp
-        })
-        
-        total_xp += xp
-        
-        # Выводим результат для этого кошелька
-        print(f"{Fore.GREEN}✓{Style.RESET_ALL} XP: {Fore.CYAN}{xp}{Style.RESET_ALL}")
-        
-        # Небольшая задержка между запросами
-        if i < len(wallet_proxies):
-            time.sleep(1)
+                    print(f"{prefix} {Fore.GREEN}✓{Style.RESET_ALL} XP: {Fore.CYAN}{xp}{Style.RESET_ALL}"
+                          f"  (всего: {total_xp}, среднее: {avg_xp:.2f})")
+        except KeyboardInterrupt:
+            print(f"\n{Fore.YELLOW}Остановлено пользователем.{Style.RESET_ALL}")
     
     # Выводим итоговую статистику
     print(f"\n{Fore.CYAN}{'='*60}")
@@ -154,24 +260,22 @@ def mode_stats(wallet_proxies: List[WalletProxy]):
     print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}\n")
     
     print(f"{Fore.YELLOW}Всего кошельков:{Style.RESET_ALL} {len(wallet_proxies)}")
+    print(f"{Fore.YELLOW}Обработано:{Style.RESET_ALL} {processed}, ошибок: {failed}")
     print(f"{Fore.YELLOW}Общий XP:{Style.RESET_ALL} {Fore.CYAN}{total_xp}{Style.RESET_ALL}")
     
-    if len(wallet_proxies) > 0:
-        avg_xp = total_xp / len(wallet_proxies)
+    if processed > 0:
+        avg_xp = total_xp / processed
         print(f"{Fore.YELLOW}Средний XP на кошелек:{Style.RESET_ALL} {Fore.CYAN}{avg_xp:.2f}{Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}Минимальный / максимальный XP:{Style.RESET_ALL} {min_xp} / {max_xp}")
+    print(f"{Fore.YELLOW}Время:{Style.RESET_ALL} {time.time() - start_time:.1f} сек")
     
-    # Детальная таблица
-    print(f"\n{Fore.CYAN}{'='*60}")
-    print(f"{Fore.CYAN}  ДЕТАЛЬНАЯ СТАТИСТИКА")
-    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}\n")
-    
-    print(f"{Fore.YELLOW}{'№':<4} {'Адрес':<45} {'XP':<12}{Style.RESET_ALL}")
-    print(f"{'-'*65}")
-    
-    for i, data in enumerate(stats_data, 1):
-        xp_str = str(data['xp'])
-        print(f"{i:<4} {data['address']:<45} {xp_str:<12}")
+    if exporter.path:
+        print(f"\n{Fore.GREEN}Детальная статистика сохранена: {exporter.path}{Style.RESET_ALL}")
     
+    stats_cache = user_stats_cache.get_stats()
+    print(f"\nСтатистика без повторной загрузки (304): {stats_cache['hits']}, полных ответов: {stats_cache['misses']}")
+    print(f"{session_registry.describe()}")
+    _export_metrics("stats")
     print(f"\n{Fore.CYAN}Завершено.{Style.RESET_ALL}\n")
 
 
@@ -185,15 +289,21 @@ def mode_bet(wallet_proxies: List[WalletProxy], available_markets: List[int] = N
         print(f"{Fore.RED}Нет кошельков для работы. Используйте режим 1 для настройки.{Style.RESET_ALL}")
         return
     
+    api_metrics.reset()
+    
     from trader import WalletTrader
-    from config import MIN_BET_AMOUNT, MAX_BET_AMOUNT, MIN_BETS_COUNT, MAX_BETS_COUNT, MIN_BET_INTERVAL_SECONDS, MAX_BET_INTERVAL_SECONDS, RANDOM_MARKETS, MARKET_ID
+    from market_cache import market_bets_cache
+    from decision_table import market_decisions
+    from dashboard import Dashboard
+    from market_index import load_available_markets
+    from config import MIN_BET_AMOUNT, MAX_BET_AMOUNT, MIN_BETS_COUNT, MAX_BETS_COUNT, MIN_BET_INTERVAL_SECONDS, MAX_BET_INTERVAL_SECONDS, RANDOM_MARKETS, MARKET_ID, DASHBOARD
     
     if available_markets is None:
         # Получаем доступные маркеты
         if RANDOM_MARKETS:
             print(f"Поиск доступных маркетов...")
             sample_api = PredictionMarketAPI(wallet_proxies[0].wallet_address, None, None)
-            available_markets = sample_api.get_available_markets(1, 200)
+            available_markets = load_available_markets(sample_api, range(1, 201))
             if available_markets:
                 print(f"{Fore.GREEN}✓ Найдено маркетов: {len(available_markets)}{Style.RESET_ALL}")
             else:
@@ -231,25 +341,40 @@ def mode_bet(wallet_proxies: List[WalletProxy], available_markets: List[int] = N
         iteration = 1
         print(f"\n{Fore.CYAN}[Итерация #{iteration}]{Style.RESET_ALL}")
         
-        for trader in traders:
-            try:
-                # Рандомно выбираем количество ставок для этого запуска
-                bets_count = random.randint(MIN_BETS_COUNT, MAX_BETS_COUNT)
-                trader.print_status(f"Делаем {bets_count} ставок в этом запуске", "INFO")
-                
-                for bet_num in range(bets_count):
-                    # Пропускаем внутреннюю проверку интервала и контролируем КД сами
-                    trader.make_bet_with_strategy(skip_interval_check=True)
-                    if bet_num < bets_count - 1:  # Не ждем после последней ставки
-                        delay = random.randint(MIN_BET_INTERVAL_SECONDS, MAX_BET_INTERVAL_SECONDS)
-                        print(f"{Fore.YELLOW}Ожидание {delay} секунд до следующей ставки...{Style.RESET_ALL}")
-                        time.sleep(delay)
-            except Exception as e:
-                trader.print_status(f"Ошибка при ставке: {e}", "ERROR")
-                import traceback
-                traceback.print_exc()
+        # Решения по всем маркетам считаются один раз на итерацию, трейдеры берут их из таблицы
+        table = market_decisions.refresh(traders[0].api, available_markets)
+        print(f"  Таблица решений: {len(table)} из {len(available_markets)} маркетов")
+        
+        # С DASHBOARD=true вместо строк по каждой ставке показывается живая панель
+        dashboard = Dashboard(traders) if DASHBOARD else None
+        if dashboard is not None:
+            dashboard.start()
+        try:
+            for trader in traders:
+                try:
+                    # Рандомно выбираем количество ставок для этого запуска
+                    bets_count = random.randint(MIN_BETS_COUNT, MAX_BETS_COUNT)
+                    trader.print_status(f"Делаем {bets_count} ставок в этом запуске", "INFO")
+                    
+                    for bet_num in range(bets_count):
+                        # Пропускаем внутреннюю проверку интервала и контролируем КД сами
+                        trader.make_bet_with_strategy(skip_interval_check=True)
+                        if bet_num < bets_count - 1:  # Не ждем после последней ставки
+                            delay = random.randint(MIN_BET_INTERVAL_SECONDS, MAX_BET_INTERVAL_SECONDS)
+                            if dashboard is None:
+                                print(f"{Fore.YELLOW}Ожидание {delay} секунд до следующей ставки...{Style.RESET_ALL}")
+                            time.sleep(delay)
+                except Exception as e:
+                    trader.print_status(f"Ошибка при ставке: {e}", "ERROR")
+                    if dashboard is None:
+                        import traceback
+                        traceback.print_exc()
+        finally:
+            if dashboard is not None:
+                dashboard.stop()
         
         # После выполнения нужного количества ставок показываем статистику и выходим
+        flush_logging()
         print(f"\n{Fore.CYAN}Итоговая статистика:{Style.RESET_ALL}")
         total_bets = sum(t.stats['total_bets'] for t in traders)
         successful_bets = sum(t.stats['successful_bets'] for t in traders)
@@ -261,6 +386,12 @@ def mode_bet(wallet_proxies: List[WalletProxy], available_markets: List[int] = N
         if total_bets > 0:
             success_rate = (successful_bets / total_bets) * 100
             print(f"  Процент успеха: {Fore.CYAN}{success_rate:.1f}%{Style.RESET_ALL}")
+        
+        cache_stats = market_bets_cache.get_stats()
+        print(f"  Кеш маркетов: попаданий {cache_stats['hits']}, загрузок {cache_stats['misses']}")
+        print(f"  {session_registry.describe()}")
             
     except KeyboardInterrupt:
-        print(f"\n\n{Fore.YELLOW}Остановлено пользователем.{Style.RESET_ALL}")
\ No newline at end of file
+        print(f"\n\n{Fore.YELLOW}Остановлено пользователем.{Style.RESET_ALL}")
+    
+    _export_metrics("bet")
\ No newline at end of file
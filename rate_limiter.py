@@ -0,0 +1,149 @@
+"""
+Ограничение частоты запросов: token bucket на каждую пару (хост, прокси, класс endpoint'а)
+"""
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from config import (
+    RATE_LIMIT_READ_PER_SEC, RATE_LIMIT_WRITE_PER_SEC, RATE_LIMIT_BURST,
+    RATE_LIMIT_BACKOFF_BASE, RATE_LIMIT_BACKOFF_MAX
+)
+
+# Класс endpoint'а определяет, из какого ведра берутся токены
+ENDPOINT_CLASSES = {
+    'bet': 'write',
+    'claim_daily': 'write',
+    'register': 'write',
+}
+
+# Максимальная скорость для каждого класса (запросов в секунду)
+CLASS_RATES = {
+    'read': RATE_LIMIT_READ_PER_SEC,
+    'write': RATE_LIMIT_WRITE_PER_SEC,
+}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Разбирает заголовок Retry-After
+
+    Returns:
+        Задержка в секундах или None, если заголовка нет или он некорректный
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket с адаптивной скоростью (AIMD)
+
+    При 429 скорость уменьшается вдвое, а ведро блокируется на Retry-After.
+    Каждый успешный ответ понемногу возвращает скорость к максимальной.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.max_rate = max(0.01, rate)
+        self.min_rate = self.max_rate / 32
+        self.rate = self.max_rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Добавляет накопившиеся токены (вызывается под блокировкой)"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """
+        Ждет, пока в ведре появится токен, и забирает его
+
+        Returns:
+            Сколько секунд пришлось ждать
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(delay)
+            waited += delay
+
+    def on_throttled(self, retry_after: Optional[float] = None):
+        """Сигнал от сервера о превышении лимита: снижаем скорость и делаем паузу"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            self.blocked_until = max(self.blocked_until, now + pause)
+
+    def on_success(self):
+        """Успешный ответ: плавно поднимаем скорость обратно к максимальной"""
+        with self.lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class RateLimiter:
+    """Набор token bucket'ов по ключу (хост, прокси, класс endpoint'а)"""
+
+    def __init__(self, class_rates: Dict[str, float] = None, burst: float = RATE_LIMIT_BURST):
+        self.class_rates = class_rates or CLASS_RATES
+        self.burst = burst
+        self._buckets: Dict[Tuple, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.throttled = 0  # Сколько раз сервер ответил 429/503
+
+    def bucket(self, host: str, proxy: Optional[str], endpoint: str) -> TokenBucket:
+        """Возвращает ведро для хоста, прокси и endpoint'а"""
+        endpoint_class = ENDPOINT_CLASSES.get(endpoint, 'read')
+        key = (host, proxy, endpoint_class)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.class_rates.get(endpoint_class, RATE_LIMIT_READ_PER_SEC), self.burst)
+                self._buckets[key] = bucket
+            return bucket
+
+    def on_throttled(self, bucket: TokenBucket, retry_after: Optional[float] = None):
+        """Учитывает ответ 429/503 для ведра"""
+        with self._lock:
+            self.throttled += 1
+        bucket.on_throttled(retry_after)
+
+    @staticmethod
+    def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Задержка перед повтором запроса (экспоненциальная, со случайным джиттером)
+
+        Args:
+            attempt: Номер повтора (с 0)
+            retry_after: Задержка из заголовка Retry-After, если сервер ее прислал
+        """
+        if retry_after is not None:
+            return min(RATE_LIMIT_BACKOFF_MAX, retry_after) + random.uniform(0, RATE_LIMIT_BACKOFF_BASE)
+        return random.uniform(0, min(RATE_LIMIT_BACKOFF_MAX, RATE_LIMIT_BACKOFF_BASE * 2 ** attempt))
+
+
+# Общий ограничитель для всех API клиентов в процессе
+rate_limiter = RateLimiter()
@@ -0,0 +1,133 @@
+"""
+Планировщик задач по сроку выполнения: очередь с приоритетом (heapq) и пул потоков
+"""
+import time
+import heapq
+import logging
+import itertools
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional
+from config import SCHEDULER_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Через сколько секунд повторить задачу, если она упала с исключением
+ERROR_RETRY_SECONDS = 30.0
+
+
+@dataclass(order=True)
+class ScheduledTask:
+    """Задача в очереди: сравнивается по сроку, при равенстве - по порядку добавления"""
+    due: float
+    seq: int
+    key: Hashable = field(compare=False)  # Задачи с одним ключом не выполняются одновременно (например, кошелек)
+    name: str = field(compare=False)
+    action: Callable[[], Optional[float]] = field(compare=False)
+
+
+class DeadlineScheduler:
+    """
+    Выполняет задачи по мере наступления их срока в пуле потоков
+
+    Действие задачи возвращает через сколько секунд выполнить ее снова
+    (None - больше не выполнять). Задачи с одинаковым ключом выполняются
+    по очереди: если срок наступил, пока задача с тем же ключом еще работает,
+    она запускается сразу после ее завершения.
+    """
+
+    def __init__(self, workers: int = SCHEDULER_WORKERS):
+        self.workers = max(1, workers)
+        self._heap: List[ScheduledTask] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._busy = set()
+        self._deferred: Dict[Hashable, List[ScheduledTask]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopped = False
+        self.in_flight = 0  # Сколько задач выполняется прямо сейчас
+        self.completed = 0  # Сколько задач выполнено
+
+    def schedule(self, key: Hashable, name: str, action: Callable[[], Optional[float]], delay: float = 0.0):
+        """
+        Добавляет задачу в очередь
+
+        Args:
+            key: Ключ последовательного выполнения (задачи с одним ключом не пересекаются)
+            name: Имя задачи (для логов)
+            action: Действие; возвращает задержку до следующего запуска или None
+            delay: Через сколько секунд выполнить задачу впервые
+        """
+        with self._cond:
+            self._push(ScheduledTask(time.monotonic() + max(0.0, delay), next(self._seq), key, name, action))
+
+    def _push(self, task: ScheduledTask):
+        """Кладет задачу в очередь (вызывается под блокировкой)"""
+        heapq.heappush(self._heap, task)
+        self._cond.notify()
+
+    def run(self):
+        """
+        Выполняет задачи, пока не вызван stop() (блокирует вызывающий поток)
+
+        Ctrl+C в вызывающем потоке прерывает ожидание, после чего нужно вызвать stop().
+        """
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scheduler')
+        while True:
+            with self._cond:
+                task = None
+                while not self._stopped:
+                    if self._heap:
+                        delay = self._heap[0].due - time.monotonic()
+                        if delay <= 0:
+                            task = heapq.heappop(self._heap)
+                            break
+                    else:
+                        delay = 1.0
+                    # Ждем короткими отрезками, чтобы Ctrl+C срабатывал на любой платформе
+                    self._cond.wait(min(delay, 0.5))
+                if self._stopped:
+                    return
+
+                if task.key in self._busy:
+                    # Кошелек еще занят предыдущей задачей - запустим сразу после нее
+                    self._deferred.setdefault(task.key, []).append(task)
+                    continue
+                self._busy.add(task.key)
+                self.in_flight += 1
+            self._executor.submit(self._execute, task)
+
+    def _execute(self, task: ScheduledTask):
+        """Выполняет задачу в потоке пула и ставит ее следующий запуск"""
+        try:
+            next_delay = task.action()
+        except Exception:
+            logger.exception(f"Задача {task.name} ({task.key}) завершилась с ошибкой")
+            next_delay = ERROR_RETRY_SECONDS
+
+        with self._cond:
+            self.in_flight -= 1
+            self.completed += 1
+            self._busy.discard(task.key)
+            if self._stopped:
+                return
+            now = time.monotonic()
+            for deferred in self._deferred.pop(task.key, []):
+                deferred.due = now
+                self._push(deferred)
+            if next_delay is not None:
+                self._push(ScheduledTask(now + max(0.0, next_delay), next(self._seq), task.key, task.name, task.action))
+
+    def stop(self, wait: bool = True):
+        """Останавливает планировщик; с wait=True дожидается выполняющихся задач"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def pending(self) -> int:
+        """Сколько задач ждет в очереди"""
+        with self._cond:
+            return len(self._heap) + sum(len(tasks) for tasks in self._deferred.values())
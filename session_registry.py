@@ -0,0 +1,199 @@
+"""
+Реестр HTTP-сессий: общий пул соединений на каждый прокси, своя сессия (cookie) у каждого клиента
+"""
+import socket
+import threading
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from config import HTTP_POOL_SIZE, HTTP_KEEPALIVE
+
+# Заголовки как в браузере
+DEFAULT_HEADERS = {
+    'accept': 'application/json, text/plain, */*',
+    'accept-encoding': 'gzip, deflate, br, zstd',
+    'accept-language': 'ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7',
+    'origin': 'https://prediction.boinknfts.club',
+    'referer': 'https://prediction.boinknfts.club/',
+    'sec-ch-ua': '"Not(A:Brand";v="8", "Chromium";v="144", "Google Chrome";v="144"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"Windows"',
+    'sec-fetch-dest': 'empty',
+    'sec-fetch-mode': 'cors',
+    'sec-fetch-site': 'cross-site',
+    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36'
+}
+
+
+def format_proxy(proxy: str) -> dict:
+    """Форматирует прокси строку для использования в requests"""
+    if not proxy:
+        return {}
+
+    # Убираем префикс http:// или https:// если есть
+    proxy = proxy.strip()
+    if proxy.startswith('http://'):
+        proxy = proxy[7:]
+    elif proxy.startswith('https://'):
+        proxy = proxy[8:]
+
+    # Если прокси содержит @, значит есть авторизация
+    if '@' in proxy:
+        # Формат: user:pass@host:port
+        auth_part, server_part = proxy.split('@', 1)
+        user, password = auth_part.split(':', 1)
+        host, port = server_part.split(':', 1)
+
+        proxy_url = f"http://{user}:{password}@{host}:{port}"
+    else:
+        # Формат: host:port
+        proxy_url = f"http://{proxy}"
+
+    return {
+        'http': proxy_url,
+        'https': proxy_url
+    }
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter с TCP keep-alive на сокетах (в том числе через прокси)"""
+
+    def __init__(self, socket_options=None, **kwargs):
+        # Атрибут нужен до вызова родительского __init__, который создает пул
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options:
+            kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        if self.socket_options:
+            proxy_kwargs['socket_options'] = self.socket_options
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+
+def _keepalive_socket_options() -> list:
+    """Опции сокета для TCP keep-alive (с учетом платформы)"""
+    options = list(HTTPConnection.default_socket_options) + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+    if hasattr(socket, 'TCP_KEEPINTVL'):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 15))
+    return options
+
+
+class SessionRegistry:
+    """
+    Выдает API клиентам сессии с общим пулом соединений на каждый прокси
+
+    Общий только HTTPAdapter (пул соединений): кошельки с одинаковым прокси
+    (или без прокси) переиспользуют TCP+TLS соединения. Сессия у каждого
+    клиента своя, поэтому cookie (реферальные, сессионные) у кошельков не
+    смешиваются.
+    """
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE, keepalive: bool = HTTP_KEEPALIVE):
+        self.pool_size = max(1, pool_size)
+        self.keepalive = keepalive
+        self._adapters: Dict[Optional[str], PooledHTTPAdapter] = {}
+        self._lock = threading.Lock()
+
+    def _create_adapter(self) -> PooledHTTPAdapter:
+        """Создает адаптер с пулом соединений для прокси"""
+        return PooledHTTPAdapter(
+            socket_options=_keepalive_socket_options() if self.keepalive else None,
+            pool_connections=10,
+            pool_maxsize=self.pool_size
+        )
+
+    def get_adapter(self, proxy: str = None) -> PooledHTTPAdapter:
+        """Возвращает общий адаптер для прокси (создает при первом обращении)"""
+        key = proxy.strip() if proxy else None
+        with self._lock:
+            adapter = self._adapters.get(key)
+            if adapter is None:
+                adapter = self._create_adapter()
+                self._adapters[key] = adapter
+            return adapter
+
+    def get_session(self, proxy: str = None) -> requests.Session:
+        """
+        Создает сессию клиента (свои cookie) на общем пуле соединений прокси
+
+        Args:
+            proxy: Прокси в формате "host:port" или "user:pass@host:port" (None - без прокси)
+        """
+        adapter = self.get_adapter(proxy)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        # Настраиваем прокси если указан
+        if proxy:
+            proxy_dict = format_proxy(proxy.strip())
+            if proxy_dict:
+                session.proxies.update(proxy_dict)
+
+        session.headers.update(DEFAULT_HEADERS)
+        if not self.keepalive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    @staticmethod
+    def _iter_pools(adapters):
+        """Перебирает пулы соединений адаптеров"""
+        for adapter in adapters:
+            managers = [adapter.poolmanager] + list(getattr(adapter, 'proxy_manager', {}).values())
+            for manager in managers:
+                if manager is None:
+                    continue
+                for key in manager.pools.keys():
+                    try:
+                        yield manager.pools[key]
+                    except KeyError:
+                        continue
+
+    def get_stats(self) -> Dict:
+        """
+        Возвращает статистику переиспользования соединений
+
+        Returns:
+            Словарь с количеством пулов (по одному на прокси), запросов, открытых соединений и долей переиспользования
+        """
+        with self._lock:
+            adapters = list(self._adapters.values())
+
+        total_requests = 0
+        total_connections = 0
+        for pool in self._iter_pools(adapters):
+            total_requests += pool.num_requests
+            total_connections += pool.num_connections
+
+        reuse_ratio = 1 - total_connections / total_requests if total_requests else 0.0
+        return {
+            'pools': len(adapters),
+            'requests': total_requests,
+            'connections': total_connections,
+            'reuse_ratio': max(0.0, reuse_ratio),
+        }
+
+    def describe(self) -> str:
+        """Возвращает строку со статистикой соединений для вывода в консоль"""
+        stats = self.get_stats()
+        return (f"Соединения: пулов {stats['pools']}, запросов {stats['requests']}, "
+                f"новых соединений {stats['connections']}, переиспользование {stats['reuse_ratio']:.0%}")
+
+    def close_all(self):
+        """Закрывает все пулы соединений"""
+        with self._lock:
+            adapters = list(self._adapters.values())
+            self._adapters.clear()
+        for adapter in adapters:
+            adapter.close()
+
+
+# Общий реестр сессий для всех API клиентов в процессе
+session_registry = SessionRegistry()
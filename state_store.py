@@ -0,0 +1,165 @@
+"""
+Состояние кошельков автотрейдера в SQLite: счетчики ставок, время последних действий и последняя статистика (XP)
+"""
+import json
+import time
+import logging
+import sqlite3
+import threading
+from typing import Dict, Optional
+from config import STATE_DB_FILE, STATE_FLUSH_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Счетчики WalletTrader.stats, которые хранятся в отдельных колонках
+COUNTER_FIELDS = ('total_bets', 'successful_bets', 'failed_bets', 'daily_claims')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS wallets (
+    address TEXT PRIMARY KEY,
+    total_bets INTEGER NOT NULL DEFAULT 0,
+    successful_bets INTEGER NOT NULL DEFAULT 0,
+    failed_bets INTEGER NOT NULL DEFAULT 0,
+    daily_claims INTEGER NOT NULL DEFAULT 0,
+    last_bet_time REAL NOT NULL DEFAULT 0,
+    last_stats_update REAL NOT NULL DEFAULT 0,
+    user_stats TEXT,
+    updated_at REAL NOT NULL
+)
+"""
+
+_UPSERT = """
+INSERT INTO wallets (address, total_bets, successful_bets, failed_bets, daily_claims,
+                     last_bet_time, last_stats_update, user_stats, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(address) DO UPDATE SET
+    total_bets = excluded.total_bets,
+    successful_bets = excluded.successful_bets,
+    failed_bets = excluded.failed_bets,
+    daily_claims = excluded.daily_claims,
+    last_bet_time = excluded.last_bet_time,
+    last_stats_update = excluded.last_stats_update,
+    user_stats = excluded.user_stats,
+    updated_at = excluded.updated_at
+"""
+
+
+class StateStore:
+    """
+    Хранилище состояния кошельков
+
+    Изменения копятся в памяти (по одной последней записи на кошелек) и
+    записываются одной транзакцией не чаще раза в STATE_FLUSH_SECONDS,
+    поэтому частые ставки не превращаются в частые записи на диск. Последние
+    изменения дописывает flush() - автотрейдер вызывает его по расписанию.
+    """
+
+    def __init__(self, path: str = STATE_DB_FILE, flush_interval: float = STATE_FLUSH_SECONDS):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: Dict[str, tuple] = {}
+        self._flushed_at = 0.0
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает базу (один раз); WAL позволяет читать, пока идет запись"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def load_all(self) -> Dict[str, Dict]:
+        """
+        Загружает сохраненное состояние всех кошельков одним запросом
+
+        Returns:
+            Словарь {адрес в нижнем регистре: {'stats', 'last_bet_time', 'last_stats_update', 'user_stats'}}
+        """
+        with self._db_lock:
+            rows = self._connect().execute(
+                "SELECT address, total_bets, successful_bets, failed_bets, daily_claims, "
+                "last_bet_time, last_stats_update, user_stats FROM wallets"
+            ).fetchall()
+        states = {}
+        for row in rows:
+            try:
+                user_stats = json.loads(row[7]) if row[7] else None
+            except ValueError:
+                user_stats = None
+            states[row[0]] = {
+                'stats': dict(zip(COUNTER_FIELDS, row[1:5])),
+                'last_bet_time': row[5],
+                'last_stats_update': row[6],
+                'user_stats': user_stats,
+            }
+        return states
+
+    def save_wallet(self, address: str, stats: Dict, last_bet_time: float, last_stats_update: float,
+                    user_stats: Optional[Dict]):
+        """
+        Запоминает текущее состояние кошелька (на диск - вместе с остальными, пачкой)
+
+        Args:
+            address: Адрес кошелька
+            stats: Счетчики WalletTrader.stats
+            last_bet_time: Время последней успешной ставки
+            last_stats_update: Время последнего обновления статистики
+            user_stats: Последний ответ статистики с сервера (XP и т.д.)
+        """
+        row = (
+            address.lower(),
+            *(int(stats.get(field, 0)) for field in COUNTER_FIELDS),
+            float(last_bet_time or 0),
+            float(last_stats_update or 0),
+            json.dumps(user_stats, ensure_ascii=False) if user_stats is not None else None,
+            time.time(),
+        )
+        with self._lock:
+            self._pending[row[0]] = row
+            flush_now = time.time() - self._flushed_at >= self.flush_interval
+        if flush_now:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Записывает накопленные изменения одной транзакцией
+
+        Returns:
+            Сколько кошельков записано
+        """
+        with self._lock:
+            rows = list(self._pending.values())
+            self._pending.clear()
+            self._flushed_at = time.time()
+        if not rows:
+            return 0
+        try:
+            with self._db_lock:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(_UPSERT, rows)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠ Не удалось сохранить состояние кошельков в {self.path}: {e}")
+            with self._lock:
+                for row in rows:
+                    self._pending.setdefault(row[0], row)
+            return 0
+        return len(rows)
+
+    def close(self):
+        """Записывает оставшиеся изменения и закрывает базу"""
+        self.flush()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Общее хранилище состояния кошельков (автотрейдер)
+state_store = StateStore()
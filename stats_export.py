@@ -0,0 +1,70 @@
+"""
+Потоковая выгрузка статистики кошельков в CSV или JSON Lines
+"""
+import os
+import csv
+import json
+from datetime import datetime
+from typing import Dict, Optional
+from config import STATS_EXPORT_FORMAT, STATS_EXPORT_DIR
+
+# Колонки выгрузки (total_xp и avg_xp - нарастающие итоги на момент строки)
+EXPORT_FIELDS = ['index', 'address', 'xp', 'level', 'error', 'total_xp', 'avg_xp']
+
+# Как часто сбрасывать буфер файла на диск (строк)
+FLUSH_EVERY = 100
+
+
+class StatsExporter:
+    """
+    Пишет строки статистики в файл по мере поступления, не накапливая их в памяти
+
+    Формат: 'csv', 'jsonl' или 'none' (выгрузка отключена).
+    """
+
+    def __init__(self, fmt: str = STATS_EXPORT_FORMAT, directory: str = STATS_EXPORT_DIR, name: str = "stats"):
+        self.fmt = (fmt or 'none').lower()
+        if self.fmt not in ('csv', 'jsonl', 'none'):
+            raise ValueError(f"Неизвестный формат выгрузки статистики: {fmt}")
+        self.directory = directory
+        self.name = name
+        self.path: Optional[str] = None
+        self.rows = 0
+        self._file = None
+        self._writer = None
+
+    def open(self) -> Optional[str]:
+        """Создает файл выгрузки и возвращает путь к нему (None, если выгрузка отключена)"""
+        if self.fmt == 'none':
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"{self.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{self.fmt}")
+        self._file = open(self.path, 'w', encoding='utf-8', newline='')
+        if self.fmt == 'csv':
+            self._writer = csv.DictWriter(self._file, fieldnames=EXPORT_FIELDS)
+            self._writer.writeheader()
+        return self.path
+
+    def write(self, row: Dict):
+        """Дописывает одну строку"""
+        if self._file is None:
+            return
+        if self._writer is not None:
+            self._writer.writerow(row)
+        else:
+            self._file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self.rows += 1
+        if self.rows % FLUSH_EVERY == 0:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'StatsExporter':
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -4,38 +4,87 @@
 import time
 import random
 import logging
+import threading
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 from colorama import init, Fore, Style
 from api_client import PredictionMarketAPI
+from market_cache import market_bets_cache
+from session_registry import session_registry
+from metrics import api_metrics
+from market_columns import MarketColumns
+from decision_table import market_decisions, fetch_market_columns
+from market_index import load_available_markets
+from scheduler import DeadlineScheduler
+from logging_setup import setup_logging, flush_logging
+from dashboard import Dashboard
+from state_store import StateStore, state_store
+from bet_journal import bet_journal
 from wallet_manager import WalletManager, WalletProxy
 from config import (
-    MIN_BET_AMOUNT, MAX_BET_AMOUNT, MIN_BETS_COUNT, MAX_BETS_COUNT,
-    MIN_BET_INTERVAL_SECONDS, MAX_BET_INTERVAL_SECONDS, MARKET_ID, RANDOM_MARKETS
+    MIN_BET_AMOUNT, MAX_BET_AMOUNT,
+    MIN_BET_INTERVAL_SECONDS, MAX_BET_INTERVAL_SECONDS, MARKET_ID, RANDOM_MARKETS,
+    MAX_AVAILABLE_MARKETS, SCHEDULER_WORKERS, STATS_REFRESH_INTERVAL_SECONDS, MARKET_CACHE_TTL_SECONDS,
+    DASHBOARD, STATE_FLUSH_SECONDS
 )
 
 # Инициализация colorama для Windows
 init(autoreset=True)
 
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('trader.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
+# Значок, цвет и уровень лога для статусов print_status
+STATUS_ICONS = {
+    "INFO": "ℹ️",
+    "SUCCESS": "✅",
+    "WARNING": "⚠️",
+    "ERROR": "❌"
+}
+
+STATUS_COLORS = {
+    "INFO": Fore.CYAN,
+    "SUCCESS": Fore.GREEN,
+    "WARNING": Fore.YELLOW,
+    "ERROR": Fore.RED
+}
+
+STATUS_LEVELS = {
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR
+}
+
+
+def log_status(source: str, message: str, status: str = "INFO", wallet: str = None):
+    """
+    Выводит статус в консоль и лог через очередь (см. logging_setup)
+
+    Args:
+        source: Метка в консоли (сокращенный адрес или GLOBAL)
+        message: Текст
+        status: INFO, SUCCESS, WARNING или ERROR
+        wallet: Полный адрес кошелька для лога (None - глобальное сообщение)
+    """
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    icon = STATUS_ICONS.get(status, "•")
+    color = STATUS_COLORS.get(status, Fore.WHITE)
+    
+    # Красивое форматирование с рамкой
+    console = f"{color}┃ {icon} [{timestamp}] [{source}] {message}{Style.RESET_ALL}"
+    logger.log(
+        STATUS_LEVELS.get(status, logging.INFO),
+        f"[{wallet or source}] {message}",
+        extra={'console': console, 'wallet': wallet, 'status': status}
+    )
+
 
 class WalletTrader:
     """Трейдер для одного кошелька"""
     
     def __init__(self, wallet_proxy: WalletProxy, available_markets: List[int]):
+        setup_logging()
         self.wallet_proxy = wallet_proxy
         self.wallet_address = wallet_proxy.wallet_address
+        self.wallet_short = self.wallet_address[:10] + "..."
         self.proxy = wallet_proxy.proxy
         self.available_markets = available_markets
         
@@ -51,34 +100,25 @@ class WalletTrader:
             'failed_bets': 0,
             'daily_claims': 0,
         }
+        self.state_store: Optional[StateStore] = None  # Куда сохранять состояние (задает AutoTrader)
+    
+    def restore_state(self, state: Dict):
+        """Восстанавливает счетчики, время последних действий и статистику из сохраненного состояния"""
+        self.stats.update(state.get('stats', {}))
+        self.last_bet_time = state.get('last_bet_time') or 0
+        self.last_stats_update = state.get('last_stats_update') or 0
+        self.user_stats = state.get('user_stats')
+    
+    def save_state(self):
+        """Передает текущее состояние в хранилище (если оно подключено)"""
+        if self.state_store is not None:
+            self.state_store.save_wallet(
+                self.wallet_address, self.stats, self.last_bet_time, self.last_stats_update, self.user_stats
+            )
     
     def print_status(self, message: str, status: str = "INFO"):
         """Красивый вывод статуса в консоль"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        wallet_short = self.wallet_address[:10] + "..."
-        
-        # Эмодзи и символы для разных статусов
-        icons = {
-            "INFO": "ℹ️",
-            "SUCCESS": "✅",
-            "WARNING": "⚠️",
-            "ERROR": "❌"
-        }
-        
-        colors = {
-            "INFO": Fore.CYAN,
-            "SUCCESS": Fore.GREEN,
-            "WARNING": Fore.YELLOW,
-            "ERROR": Fore.RED
-        }
-        
-        icon = icons.get(status, "•")
-        color = colors.get(status, Fore.WHITE)
-        
-        # Красивое форматирование с рамкой
-        formatted_message = f"{color}┃ {icon} [{timestamp}] [{wallet_short}] {message}{Style.RESET_ALL}"
-        print(formatted_message)
-        logger.info(f"[{self.wallet_address}] {message}")
+        log_status(self.wallet_short, message, status, self.wallet_address)
     
     def get_random_market(self) -> int:
         """Получает рандомный доступный маркет"""
@@ -89,16 +129,26 @@ class WalletTrader:
             return random.choice(self.available_markets)
         return MARKET_ID
     
+    def _fetch_market_bets(self, market_id: int) -> MarketColumns:
+        """Загружает ставки маркета в колонки (потоково, если включено MARKET_BETS_STREAMING)"""
+        return fetch_market_columns(self.api, market_id)
+    
     def analyze_market(self, market_id: int) -> Optional[str]:
         """Анализирует маркет и возвращает рекомендуемый исход"""
+        # Решение из общей таблицы, построенной по всем маркетам (см. decision_table)
+        decision = market_decisions.lookup(market_id)
+        if decision is not None:
+            return decision.outcome or random.choice(["YES", "NO"])
+        
         try:
-            bets = self.api.get_market_bets(market_id)
+            # Снимок ставок общий для всех кошельков (см. market_cache)
+            columns = market_bets_cache.get(market_id, self._fetch_market_bets)
             
-            if not bets:
+            if not len(columns):
                 return random.choice(["YES", "NO"])
             
-            yes_amount = sum(float(bet.get('amount', 0)) for bet in bets if bet.get('outcome', '').upper() == 'YES')
-            no_amount = sum(float(bet.get('amount', 0)) for bet in bets if bet.get('outcome', '').upper() == 'NO')
+            # Суммы YES/NO считаются векторно по колонкам снимка
+            yes_amount, no_amount = columns.totals()
             
             if yes_amount > no_amount:
                 return "NO"
@@ -145,6 +195,8 @@ class WalletTrader:
             self.last_bet_time = current_time
             self.stats['total_bets'] += 1
             self.stats['successful_bets'] += 1
+            self.save_state()
+            bet_journal.record(self.wallet_address, market_id, outcome, amount, True)
             
             self.print_status(f"Ставка успешно размещена!", "SUCCESS")
             return True
@@ -152,6 +204,8 @@ class WalletTrader:
         except Exception as e:
             self.stats['total_bets'] += 1
             self.stats['failed_bets'] += 1
+            self.save_state()
+            bet_journal.record(self.wallet_address, market_id, outcome, amount, False, str(e))
             self.print_status(f"Ошибка при размещении ставки: {e}", "ERROR")
             return False
     
@@ -162,6 +216,7 @@ class WalletTrader:
             result = self.api.claim_daily()
             
             self.stats['daily_claims'] += 1
+            self.save_state()
             self.print_status(f"Ежедневная награда получена!", "SUCCESS")
             return True
             
@@ -184,6 +239,7 @@ class WalletTrader:
             stats = self.api.get_user_stats()
             self.user_stats = stats
             self.last_stats_update = time.time()
+            self.save_state()
             
             # Извлекаем XP если есть
             xp = stats.get('xp', stats.get('XP', stats.get('experience', 0)))
@@ -200,6 +256,8 @@ class AutoTrader:
     """Главный класс для управления несколькими кошельками"""
     
     def __init__(self):
+        setup_logging()
+        
         # Загружаем кошельки и прокси
         wm = WalletManager()
         self.wallet_proxies = wm.get_wallet_proxies()
@@ -209,21 +267,30 @@ class AutoTrader:
         
         # Обновляем список доступных маркетов (используем первый кошелек для проверки)
         self.available_markets = [MARKET_ID]
+        self.traders: List[WalletTrader] = []
+        self._markets_lock = threading.Lock()  # Подмена списка маркетов и создание трейдеров
         if RANDOM_MARKETS:
             self.print_status("Поиск доступных маркетов...", "INFO")
-            first_api = PredictionMarketAPI(self.wallet_proxies[0].wallet_address, self.wallet_proxies[0].proxy)
+            first_api = PredictionMarketAPI(self.wallet_proxies[0].wallet_address, proxy=self.wallet_proxies[0].proxy)
             # Проверяем только несколько маркетов для скорости
-            for market_id in range(1, 50):
-                if first_api.is_market_available(market_id):
-                    self.available_markets.append(market_id)
-                if len(self.available_markets) >= 20:
-                    break
+            candidates = [market_id for market_id in range(1, 50) if market_id != MARKET_ID]
+            found = load_available_markets(first_api, candidates, MAX_AVAILABLE_MARKETS - len(self.available_markets),
+                                           on_update=self._publish_markets)
+            with self._markets_lock:
+                if self.available_markets == [MARKET_ID]:  # Фоновая проверка еще не подменила список
+                    self.available_markets = [MARKET_ID] + found
         
         # Создаем трейдеров для каждого кошелька
-        self.traders = [
-            WalletTrader(wp, self.available_markets) 
-            for wp in self.wallet_proxies
-        ]
+        with self._markets_lock:
+            self.traders = [
+                WalletTrader(wp, self.available_markets) 
+                for wp in self.wallet_proxies
+            ]
+        self.restored = self.restore_state()  # Сколько кошельков продолжили с сохраненного состояния
+        
+        self.scheduler: Optional[DeadlineScheduler] = None
+        self.dashboard: Optional[Dashboard] = None  # Живая панель (DASHBOARD=true)
+        self.reports = 0  # Сколько периодических отчетов выведено
         
         self.global_stats = {
             'total_bets': 0,
@@ -232,35 +299,48 @@ class AutoTrader:
             'daily_claims': 0,
         }
     
-    def print_status(self, message: str, status: str = "INFO"):
-        """Красивый вывод статуса в консоль"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        # Эмодзи и символы для разных статусов
-        icons = {
-            "INFO": "ℹ️",
-            "SUCCESS": "✅",
-            "WARNING": "⚠️",
-            "ERROR": "❌"
-        }
-        
-        colors = {
-            "INFO": Fore.CYAN,
-            "SUCCESS": Fore.GREEN,
-            "WARNING": Fore.YELLOW,
-            "ERROR": Fore.RED
-        }
+    def _publish_markets(self, markets: List[int]):
+        """
+        Подменяет список маркетов у автотрейдера и всех трейдеров (вызывается фоновой проверкой индекса)
         
-        icon = icons.get(status, "•")
-        color = colors.get(status, Fore.WHITE)
+        Список не изменяется на месте: трейдеры получают новый, поэтому случайный
+        выбор маркета в другом потоке всегда видит целый список.
+        """
+        with self._markets_lock:
+            self.available_markets = [MARKET_ID] + [market_id for market_id in markets if market_id != MARKET_ID]
+            for trader in self.traders:
+                trader.available_markets = self.available_markets
+        self.print_status(f"Список маркетов обновлен фоновой проверкой индекса: {len(self.available_markets)}", "INFO")
+    
+    def restore_state(self, store: StateStore = state_store) -> int:
+        """
+        Подключает трейдеров к хранилищу и восстанавливает их состояние после перезапуска
         
-        # Красивое форматирование с рамкой
-        formatted_message = f"{color}┃ {icon} [{timestamp}] [GLOBAL] {message}{Style.RESET_ALL}"
-        print(formatted_message)
-        logger.info(f"[GLOBAL] {message}")
+        Returns:
+            Сколько кошельков найдено в хранилище
+        """
+        try:
+            states = store.load_all()
+        except Exception as e:
+            self.print_status(f"Не удалось загрузить состояние кошельков: {e}", "WARNING")
+            states = {}
+        restored = 0
+        for trader in self.traders:
+            trader.state_store = store
+            state = states.get(trader.wallet_address.lower())
+            if state:
+                trader.restore_state(state)
+                restored += 1
+        return restored
+    
+    def print_status(self, message: str, status: str = "INFO"):
+        """Красивый вывод статуса в консоль"""
+        log_status("GLOBAL", message, status)
     
     def print_stats(self):
         """Выводит общую статистику"""
+        # Сначала дописываем статусы из очереди лога, чтобы таблица не перемешалась с ними
+        flush_logging()
         # Собираем статистику со всех трейдеров
         total_bets = sum(t.stats['total_bets'] for t in self.traders)
         successful_bets = sum(t.stats['successful_bets'] for t in self.traders)
@@ -275,6 +355,20 @@ class AutoTrader:
         print(f"{Fore.MAGENTA}║{'Неудачных:':<35} {Fore.RED}{failed_bets:>21}{Style.RESET_ALL}{Fore.MAGENTA}║{Style.RESET_ALL}")
         print(f"{Fore.MAGENTA}║{'Клеймов дейлика:':<35} {Fore.CYAN}{daily_claims:>21}{Style.RESET_ALL}{Fore.MAGENTA}║{Style.RESET_ALL}")
         print(f"{Fore.MAGENTA}║{'Доступных маркетов:':<35} {Fore.YELLOW}{len(self.available_markets):>21}{Style.RESET_ALL}{Fore.MAGENTA}║{Style.RESET_ALL}")
+        connection_stats = session_registry.get_stats()
+        reuse = f"{connection_stats['reuse_ratio']:.0%}"
+        print(f"{Fore.MAGENTA}║{'Переиспользование соединений:':<35} {Fore.CYAN}{reuse:>21}{Style.RESET_ALL}{Fore.MAGENTA}║{Style.RESET_ALL}")
+        
+        # Задержки и количество запросов по endpoint'ам
+        endpoints = api_metrics.snapshot()['endpoints']
+        if endpoints:
+            print(f"{Fore.MAGENTA}{'╠' + '═'*58 + '╣'}{Style.RESET_ALL}")
+            print(f"{Fore.MAGENTA}║{'⏱ ЗАПРОСЫ К API (задержка, мс):':^58}║{Style.RESET_ALL}")
+            print(f"{Fore.MAGENTA}{'╠' + '═'*58 + '╣'}{Style.RESET_ALL}")
+            for name, data in endpoints.items():
+                latency = data['latency_ms']
+                info = f"  {name:<12} {data['count']:>6} p50 {latency['p50']:>5.0f} p95 {latency['p95']:>5.0f} p99 {latency['p99']:>5.0f}"
+                print(f"{Fore.MAGENTA}║{info:<58}{Fore.MAGENTA}║{Style.RESET_ALL}")
         
         # Выводим статистику по каждому кошельку (XP и т.д.)
         if self.traders:
@@ -295,70 +389,107 @@ class AutoTrader:
         
         print(f"{Fore.MAGENTA}{'╚' + '═'*58 + '╝'}{Style.RESET_ALL}\n")
     
+    def _bet_task(self, trader: WalletTrader):
+        """Задача ставок кошелька: одна ставка, следующая - через MIN..MAX_BET_INTERVAL_SECONDS"""
+        def action() -> float:
+            trader.make_bet_with_strategy()
+            return random.uniform(MIN_BET_INTERVAL_SECONDS, MAX_BET_INTERVAL_SECONDS)
+        return action
+    
+    def _stats_task(self, trader: WalletTrader):
+        """Задача обновления статистики кошелька раз в STATS_REFRESH_INTERVAL_SECONDS"""
+        def action() -> float:
+            trader.update_user_stats()
+            return STATS_REFRESH_INTERVAL_SECONDS
+        return action
+    
+    def _decisions_task(self) -> float:
+        """Пересчет таблицы решений по всем доступным маркетам раз в MARKET_CACHE_TTL_SECONDS"""
+        started = time.time()
+        table = market_decisions.refresh(self.traders[0].api, self.available_markets)
+        logger.info(f"[GLOBAL] Таблица решений: {len(table)} маркетов за {time.time() - started:.2f} сек")
+        return max(1.0, MARKET_CACHE_TTL_SECONDS)
+    
+    def _report_task(self) -> float:
+        """Периодический отчет: кеш маркетов за период и общая статистика каждые 10 отчетов"""
+        self.reports += 1
+        cache_stats = market_bets_cache.get_stats()
+        self.print_status(
+            f"Кеш маркетов за период: попаданий {cache_stats['hits']}, загрузок {cache_stats['misses']}; "
+            f"задач в работе: {self.scheduler.in_flight}, в очереди: {self.scheduler.pending()}, "
+            f"маркетов в таблице решений: {len(market_decisions.table or ())}",
+            "INFO"
+        )
+        market_bets_cache.reset_stats()
+        # С живой панелью общая статистика видна на ней, таблицу не выводим
+        if self.reports % 10 == 0 and self.dashboard is None:
+            self.print_stats()
+        return max(1.0, MAX_BET_INTERVAL_SECONDS)
+    
+    def _state_task(self) -> float:
+        """Запись накопленного состояния кошельков раз в STATE_FLUSH_SECONDS, даже если новых ставок нет"""
+        state_store.flush()
+        return max(1.0, STATE_FLUSH_SECONDS)
+    
+    def _stop_dashboard(self):
+        """Останавливает живую панель и возвращает вывод событий в консоль"""
+        if self.dashboard is not None:
+            self.dashboard.stop()
+            self.dashboard = None
+    
     def run(self):
-        """Основной цикл торговли"""
+        """Основной цикл торговли: задачи кошельков выполняются планировщиком по сроку"""
         self.print_status("="*60, "INFO")
         self.print_status("ЗАПУСК АВТОМАТИЧЕСКОЙ ТОРГОВЛИ", "INFO")
         self.print_status("="*60, "INFO")
         self.print_status(f"Кошельков: {len(self.traders)}", "INFO")
         self.print_status(f"Режим: {'Рандомные маркеты' if RANDOM_MARKETS else f'Маркет {MARKET_ID}'}", "INFO")
-        self.print_status(f"Интервал между итерациями: {MIN_BET_INTERVAL_SECONDS} - {MAX_BET_INTERVAL_SECONDS} сек", "INFO")
+        self.print_status(f"Интервал между ставками кошелька: {MIN_BET_INTERVAL_SECONDS} - {MAX_BET_INTERVAL_SECONDS} сек", "INFO")
         self.print_status(f"Сумма ставок: {MIN_BET_AMOUNT} - {MAX_BET_AMOUNT}", "INFO")
-        self.print_status(f"Количество ставок за итерацию: {MIN_BETS_COUNT} - {MAX_BETS_COUNT}", "INFO")
+        self.print_status(f"Потоков планировщика: {SCHEDULER_WORKERS}", "INFO")
+        if self.restored:
+            self.print_status(f"Состояние восстановлено для {self.restored} кошельков ({state_store.path})", "INFO")
         self.print_status("="*60, "INFO")
         
-        # Шаг 0: Получение статистики для всех кошельков
-        self.print_status("\n[ШАГ 0] Получение статистики кошельков...", "INFO")
-        for trader in self.traders:
-            trader.update_user_stats()
-            time.sleep(1)  # Задержка между кошельками
+        # Первая задача каждого кошелька - получение статистики, затем ставки
+        # со своим интервалом. Для клейма дейлика используйте режим 2 в меню
+        self.print_status("\nНачало автоматической торговли...", "INFO")
+        self.print_status("Нажмите Ctrl+C для остановки\n", "INFO")
         
-        # Шаг 1: Клейм дейлика для всех кошельков (опционально, можно включить если нужно)
-        # Для клейма дейлика используйте режим 2 в меню
-        # self.print_status("\n[ШАГ 1] Клейм ежедневных наград...", "INFO")
-        # for trader in self.traders:
-        #     trader.claim_daily_reward()
-        #     time.sleep(2)  # Задержка между кошельками
+        self.scheduler = DeadlineScheduler(SCHEDULER_WORKERS)
+        # Таблица решений строится первой, пока она не готова - трейдеры анализируют маркет сами
+        self.scheduler.schedule("decisions", "decisions", self._decisions_task)
+        # После перезапуска кошелек продолжает со своего темпа: ставка не раньше
+        # MIN_BET_INTERVAL_SECONDS после прошлой, статистика - когда истек период обновления
+        now = time.time()
+        for trader in self.traders:
+            stats_delay = trader.last_stats_update + STATS_REFRESH_INTERVAL_SECONDS - now if trader.user_stats else 0.0
+            bet_delay = trader.last_bet_time + MIN_BET_INTERVAL_SECONDS - now
+            self.scheduler.schedule(trader.wallet_address, "stats", self._stats_task(trader), delay=max(0.0, stats_delay))
+            self.scheduler.schedule(trader.wallet_address, "bet", self._bet_task(trader), delay=max(0.0, bet_delay))
+        self.scheduler.schedule("report", "report", self._report_task, delay=MAX_BET_INTERVAL_SECONDS)
+        self.scheduler.schedule("state", "state", self._state_task, delay=max(1.0, STATE_FLUSH_SECONDS))
         
-        # Шаг 2: Клейм фаусетов для всех кошельков
-        # Шаг 2: Начало автоматической торговли
-        self.print_status("\n[ШАГ 2] Начало автоматической торговли...", "INFO")
-        self.print_status("Нажмите Ctrl+C для остановки\n", "INFO")
+        if DASHBOARD:
+            self.dashboard = Dashboard(self.traders, self.scheduler)
+            self.dashboard.start()
         
         try:
-            iteration = 0
-            while True:
-                iteration += 1
-                
-                # Проходим по всем кошелькам и делаем ставки
-                for trader in self.traders:
-                    # Рандомно выбираем количество ставок для этой итерации
-                    bets_count = random.randint(MIN_BETS_COUNT, MAX_BETS_COUNT)
-                    self.print_status(f"Итерация #{iteration}: делаем {bets_count} ставок", "INFO")
-                    
-                    for bet_num in range(bets_count):
-                        trader.make_bet_with_strategy()
-                        if bet_num < bets_count - 1:  # Не ждем после последней ставки
-                            time.sleep(2)  # Небольшая задержка между ставками одного кошелька
-                    time.sleep(1)  # Небольшая задержка между кошельками
-                
-                # Обновляем статистику каждые 5 итераций
-                if iteration % 5 == 0:
-                    for trader in self.traders:
-                        trader.update_user_stats()
-                        time.sleep(0.5)
-                
-                # Показываем статистику каждые 10 итераций
-                if iteration % 10 == 0:
-                    self.print_stats()
-                
-                # Небольшая задержка перед следующей итерацией
-                time.sleep(5)
-                
+            self.scheduler.run()
         except KeyboardInterrupt:
+            self.scheduler.stop()
+            self._stop_dashboard()
             self.print_status("\nОстановка торговли...", "WARNING")
             self.print_stats()
         except Exception as e:
+            self.scheduler.stop()
+            self._stop_dashboard()
             self.print_status(f"Критическая ошибка: {e}", "ERROR")
             self.print_stats()
             raise
+        finally:
+            state_store.flush()
+            bet_journal.flush()
+            path = api_metrics.export_json("autotrader")
+            if path:
+                self.print_status(f"Метрики запросов сохранены: {path}", "INFO")
@@ -143,16 +143,18 @@ class WalletManager:
         # Если есть приватные ключи, извлекаем адреса из них
         if private_keys:
             print("Извлечение адресов кошельков из приватных ключей...")
-            from crypto_utils import verify_address_from_key
+            from address_cache import derive_addresses
+            
+            # Адреса берутся из кеша на диске, недостающие вычисляются в пуле процессов
+            derived = derive_addresses(private_keys)
             
             extracted_wallets = []
-            for i, private_key in enumerate(private_keys, 1):
-                try:
-                    address = verify_address_from_key(private_key)
+            for i, (address, error) in enumerate(derived, 1):
+                if address:
                     extracted_wallets.append(address)
                     print(f"  {i}. Извлечен адрес: {address}")
-                except Exception as e:
-                    print(f"  ⚠ Ошибка при извлечении адреса из ключа {i}: {e}")
+                else:
+                    print(f"  ⚠ Ошибка при извлечении адреса из ключа {i}: {error}")
                     # Если не удалось извлечь, используем адрес из wallets.txt если есть
                     if i <= len(wallets):
                         extracted_wallets.append(wallets[i-1])